@@ -0,0 +1,84 @@
+import constants
+
+# lavere = viktigere når budsjettet ikke rekker til alle
+_STATE_RANK = {"search": 0, "chase": 0, "attack": 0, "hurt": 1, "walk": 1, "idle": 2}
+
+class AIScheduler:
+    """
+    Fordeler fiende-AI (sansing, state-maskin, planlegging) over ticks.
+
+    Hver fiende har en LOD-intervall (ticks mellom "tenk"-ticks) etter avstand
+    til spilleren: nær → hver tick, innenfor DETECTION_RADIUS → AI_LOD_MID_INTERVAL,
+    langt unna → AI_LOD_FAR_INTERVAL. Mellom tenk-ticks går fienden videre mot
+    forrige mål (samlet i enemy_motion.move_enemies), så bevegelsen er jevn.
+
+    Fiender som er forfalt konkurrerer om et budsjett per tick (AI_THINK_BUDGET
+    tenk-kall, og valgfritt AI_TIME_BUDGET_MS), sortert på state og avstand.
+    Jo lenger en fiende har ventet, jo høyere prioritet (round-robin, ingen sulting).
+    Truffet/død fiende og chase/attack nær spilleren tenker alltid (utenfor budsjettet).
+
+    Public API:
+      - schedule(enemies, player): mengden fiender som skal kjøre move() denne ticken.
+      - record(thinks, seconds): målt tid for tenk-kallene; World måler og kaller den bare
+        når time_budget_ms er satt.
+      - Tellere for siste tick: last_thinks, last_deferred.
+
+    Uten tidsbudsjett (standard) er planen deterministisk.
+    """
+
+    def __init__(self, budget=None, time_budget_ms=None):
+        self.budget = budget if budget is not None else constants.AI_THINK_BUDGET
+        self.time_budget_ms = time_budget_ms if time_budget_ms is not None else constants.AI_TIME_BUDGET_MS
+        self.tick = 0
+        self.last_thinks = 0
+        self.last_deferred = 0
+        self._think_ms = None      # glidende snitt, ms per tenk-kall
+
+    def schedule(self, enemies, player):
+        self.tick += 1
+        tick = self.tick
+        px, py = player.rect.center
+        near2 = constants.AI_LOD_NEAR_PX * constants.AI_LOD_NEAR_PX
+        mid2 = constants.DETECTION_RADIUS * constants.DETECTION_RADIUS
+
+        think = set()
+        queue = []
+        for e in enemies:
+            dx, dy = e.pos.x - px, e.pos.y - py
+            d2 = dx * dx + dy * dy
+            if d2 <= near2:
+                interval = 1
+            elif d2 <= mid2 or e.state in ("chase", "search"):
+                interval = constants.AI_LOD_MID_INTERVAL
+            else:
+                interval = constants.AI_LOD_FAR_INTERVAL
+
+            if e.hit or e.health <= 0 or (d2 <= near2 and e.state in ("chase", "attack")):
+                think.add(e)
+                e.ai_next_tick = tick + interval
+            elif e.ai_next_tick <= tick:
+                overdue = tick - e.ai_next_tick
+                queue.append((_STATE_RANK.get(e.state, 1) - overdue, d2, e.handle, e, interval))
+
+        queue.sort(key=lambda q: q[:3])
+        budget = self._budget()
+        for _, _, _, e, interval in queue[:budget]:
+            think.add(e)
+            e.ai_next_tick = tick + interval
+
+        self.last_thinks = len(think)
+        self.last_deferred = max(0, len(queue) - budget)
+        return think
+
+    def record(self, thinks, seconds):
+        if not thinks or self.time_budget_ms is None:
+            return
+        ms = seconds * 1000.0 / thinks
+        self._think_ms = ms if self._think_ms is None else 0.9 * self._think_ms + 0.1 * ms
+
+    # ---------- helpers ----------
+    def _budget(self):
+        budget = self.budget
+        if self.time_budget_ms is not None and self._think_ms:
+            budget = min(budget, max(1, int(self.time_budget_ms / self._think_ms)))
+        return budget
@@ -0,0 +1,256 @@
+"""
+Reproduserbare headless-benchmarks med skriptede scenarier.
+
+Hvert scenario bygges fra GridRoom-rom og World.spawn_wave, kjøres et fast
+antall ticks med fast seed, og rapporterer ms/tick (snitt/p50/p95) og
+allokeringer (tracemalloc, egen kjøring så tidene ikke påvirkes).
+
+--scaling kjører et scenario over flere entitetsantall og tilpasser
+ms/tick ~ n^k (log-log). Er k over --max-exponent, avsluttes det med
+kode 1, slik at en O(n²)-regresjon i World.update blir fanget.
+
+Eksempler:
+    python benchmark.py
+    python benchmark.py idle_wanderers --n 1000 --ticks 300
+    python benchmark.py --scaling search_chase --counts 50 100 200 400 --max-exponent 1.4
+"""
+import argparse
+import json
+import math
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pygame
+
+import constants
+from gamecontroller import InputState
+from grid_room import GridRoom
+from headless import HeadlessGame
+
+# ------------------------- scenarier -------------------------
+
+def _combat_room(game):
+    """Last r1 (første combat-rom) og plasser spilleren midt i."""
+    rm = game.room_manager
+    room = rm.rooms["combat"][0]
+    rm._load_room(room, entry_side=None)
+    T = constants.TILE_SIZE
+    game.player.rect.center = (room.cols * T // 2, room.rows * T // 2)
+    game.player.health = 10 ** 9  # benchmarken skal ikke stoppe av at spilleren dør
+    return room
+
+def _interior(room):
+    T = constants.TILE_SIZE
+    return pygame.Rect(T, T, (room.cols - 2) * T, (room.rows - 2) * T)
+
+def setup_idle_wanderers(game, n):
+    room = _combat_room(game)
+    game.world.spawn_wave(n, _interior(room))
+    # spilleren langt utenfor DETECTION_RADIUS → alle forblir idle/wander
+    game.player.rect.topleft = (-100000, -100000)
+
+def tick_idle_wanderers(game, tick):
+    return InputState()
+
+def setup_search_chase(game, n):
+    room = _combat_room(game)
+    game.world.spawn_wave(n, _interior(room))
+    for e in game.world.enemies:
+        e.state = "search"
+        e.last_seen_pos = game.player.rect.center
+        e.search_started = game.clock.get_ticks()
+
+def tick_search_chase(game, tick):
+    # spilleren går frem og tilbake; fiendene får ny "sist sett" hvert 30. tick
+    if tick % 30 == 0:
+        now = game.clock.get_ticks()
+        for e in game.world.enemies:
+            if e.state in ("idle", "search"):
+                e.state = "search"
+                e.last_seen_pos = game.player.rect.center
+                e.search_started = now
+    phase = (tick // 120) % 2
+    return InputState(right=phase == 0, left=phase == 1)
+
+def setup_bullet_storm(game, n):
+    room = _combat_room(game)
+    game.world.spawn_wave(n, _interior(room))
+
+def tick_bullet_storm(game, tick):
+    # skyt hver tick i roterende retning (cooldown slås av i run_scenario)
+    a = tick * 0.3
+    cx, cy = game.player.rect.center
+    return InputState(fire=True, aim=(cx + math.cos(a) * 200, cy + math.sin(a) * 200))
+
+def setup_death_bursts(game, n):
+    _combat_room(game)
+
+def tick_death_bursts(game, tick):
+    # hvert 20. tick: n fiender spawner, neste tick dør alle samtidig
+    world = game.world
+    if tick % 20 == 0:
+        world.spawn_wave(game.bench_n, _interior(world.current_room))
+    elif tick % 20 == 1:
+        for e in world.enemies:
+            e.health = 0
+    return InputState()
+
+def _big_room(cols=96, rows=48):
+    """Stort rom (over NAV_HPA_MIN_TILES) med vegg-rader som har åpninger – lange omveier."""
+    lines = []
+    for y in range(rows):
+        row = []
+        for x in range(cols):
+            border = x in (0, cols - 1) or y in (0, rows - 1)
+            # loddrette vegger hver 12. kolonne, åpning annenhver gang øverst/nederst
+            wall = x % 12 == 0 and 0 < x < cols - 1 and (y > 4 if (x // 12) % 2 else y < rows - 5)
+            row.append('#' if border or wall else '.')
+        lines.append("".join(row))
+    return GridRoom(lines)
+
+def setup_big_room_search(game, n):
+    room = _big_room()
+    rm = game.room_manager
+    rm._load_room(room, entry_side=None)
+    T = constants.TILE_SIZE
+    game.player.rect.center = (2 * T, 2 * T)
+    game.player.health = 10 ** 9
+    game.world.spawn_wave(n, pygame.Rect(room.cols * T // 2, T, (room.cols // 2 - 2) * T, (room.rows - 2) * T))
+    tick_big_room_search(game, 0)
+
+def tick_big_room_search(game, tick):
+    # spilleren "sees" et nytt sted hvert 60. tick → nye lange søk
+    if tick % 60 == 0:
+        T = constants.TILE_SIZE
+        rows = game.world.current_room.rows
+        target = (2 * T + T // 2, (2 + (tick // 60) * 7 % (rows - 4)) * T + T // 2)
+        now = game.clock.get_ticks()
+        for e in game.world.enemies:
+            e.state = "search"
+            e.last_seen_pos = target
+            e.search_started = now
+    return InputState()
+
+# navn -> (setup, tick, standard n, ekstra konstanter under kjøring)
+SCENARIOS = {
+    "idle_wanderers": (setup_idle_wanderers, tick_idle_wanderers, 1000, {}),
+    "search_chase":   (setup_search_chase, tick_search_chase, 200, {}),
+    "bullet_storm":   (setup_bullet_storm, tick_bullet_storm, 100, {"PLAYER_ATTACK_COOLDOWN": 0}),
+    "death_bursts":   (setup_death_bursts, tick_death_bursts, 200, {}),
+    "big_room_search": (setup_big_room_search, tick_big_room_search, 100,
+                        {"LOSE_SIGHT_TIME": 10 ** 9, "DETECTION_RADIUS": 0}),
+}
+
+# ------------------------- kjøring -------------------------
+
+def _build(name, n, seed):
+    setup, tick_fn, default_n, _ = SCENARIOS[name]
+    game = HeadlessGame(seed=seed)
+    game.bench_n = n if n is not None else default_n
+    setup(game, game.bench_n)
+    return game, tick_fn
+
+def _run_ticks(game, tick_fn, ticks, times=None):
+    for t in range(ticks):
+        inp = tick_fn(game, t)
+        t0 = time.perf_counter()
+        game.step(inp)
+        if times is not None:
+            times.append(time.perf_counter() - t0)
+
+def run_scenario(name, n=None, ticks=300, seed=1234, measure_alloc=True):
+    """Kjør ett scenario og returner et resultat-dict (tider i ms)."""
+    overrides = SCENARIOS[name][3]
+    saved = {k: getattr(constants, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(constants, k, v)
+    try:
+        game, tick_fn = _build(name, n, seed)
+        times = []
+        _run_ticks(game, tick_fn, ticks, times)
+        ms = np.array(times) * 1000.0
+        result = {
+            "scenario": name,
+            "n": game.bench_n,
+            "ticks": ticks,
+            "seed": seed,
+            "ms_per_tick": round(float(ms.mean()), 4),
+            "p50": round(float(np.percentile(ms, 50)), 4),
+            "p95": round(float(np.percentile(ms, 95)), 4),
+            "enemies_end": len(game.world.enemies),
+        }
+
+        if measure_alloc:
+            # ny, identisk kjøring under tracemalloc
+            game, tick_fn = _build(name, n, seed)
+            tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            _run_ticks(game, tick_fn, ticks)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result["alloc_net_kib"] = round((current - before) / 1024, 1)
+            result["alloc_peak_kib"] = round((peak - before) / 1024, 1)
+        return result
+    finally:
+        for k, v in saved.items():
+            setattr(constants, k, v)
+
+def fit_scaling(name, counts, ticks=120, seed=1234):
+    """Kjør scenariet for hver n i counts og tilpass ms/tick ~ a * n^k. Returnerer (k, resultater)."""
+    results = [run_scenario(name, n=c, ticks=ticks, seed=seed, measure_alloc=False) for c in counts]
+    xs = np.log([r["n"] for r in results])
+    ys = np.log([max(r["ms_per_tick"], 1e-6) for r in results])
+    k, _ = np.polyfit(xs, ys, 1)
+    return float(k), results
+
+# ------------------------- CLI -------------------------
+
+def _print_result(r):
+    alloc = ""
+    if "alloc_peak_kib" in r:
+        alloc = "  alloc net %8.1f KiB  peak %8.1f KiB" % (r["alloc_net_kib"], r["alloc_peak_kib"])
+    print("%-15s n=%5d  %8.3f ms/tick  p50 %8.3f  p95 %8.3f%s" % (
+        r["scenario"], r["n"], r["ms_per_tick"], r["p50"], r["p95"], alloc))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("scenarios", nargs="*", help="scenarier (standard: alle)")
+    ap.add_argument("--n", type=int, default=None, help="antall entiteter (standard per scenario)")
+    ap.add_argument("--ticks", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=1234)
+    ap.add_argument("--no-alloc", action="store_true", help="hopp over tracemalloc-kjøringen")
+    ap.add_argument("--scaling", metavar="SCENARIO", help="tilpass skaleringskurve for scenariet")
+    ap.add_argument("--counts", type=int, nargs="+", default=[50, 100, 200, 400, 800])
+    ap.add_argument("--max-exponent", type=float, default=1.5, help="feil hvis skaleringseksponent er over")
+    ap.add_argument("--json", metavar="PATH", help="legg resultater til som JSON-linjer")
+    args = ap.parse_args(argv)
+
+    records = []
+    status = 0
+    if args.scaling:
+        k, results = fit_scaling(args.scaling, args.counts, ticks=args.ticks, seed=args.seed)
+        for r in results:
+            _print_result(r)
+        ok = k <= args.max_exponent
+        print("%s: ms/tick ~ n^%.2f (grense %.2f) %s" % (args.scaling, k, args.max_exponent, "OK" if ok else "FOR HØY"))
+        records.extend(results)
+        records.append({"scenario": args.scaling, "scaling_exponent": round(k, 3), "counts": args.counts})
+        status = 0 if ok else 1
+    else:
+        for name in args.scenarios or list(SCENARIOS):
+            if name not in SCENARIOS:
+                ap.error("ukjent scenario: %s (har: %s)" % (name, ", ".join(SCENARIOS)))
+            r = run_scenario(name, n=args.n, ticks=args.ticks, seed=args.seed, measure_alloc=not args.no_alloc)
+            _print_result(r)
+            records.append(r)
+
+    if args.json:
+        with open(args.json, "a", encoding="utf-8") as f:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
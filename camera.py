@@ -14,6 +14,15 @@ class Camera:
         # World -> screen
         return rect.move(-self.offset.x, -self.offset.y)
 
+    def visible_rect(self, margin=0):
+        # World-rect som dekker skjermen (+ margin px på alle kanter)
+        return pygame.Rect(
+            int(self.offset.x) - 1 - margin,
+            int(self.offset.y) - 1 - margin,
+            self.sw + 2 + 2 * margin,
+            self.sh + 2 + 2 * margin
+        )
+
     def screen_to_world(self, pos):
         # Screen -> world
         return pygame.Vector2(
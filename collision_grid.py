@@ -0,0 +1,124 @@
+import pygame
+import constants
+
+class CollisionGrid:
+    """
+    Tile-indeksert kollisjonsoppslag for ett rom.
+
+    I stedet for å sjekke en rect mot alle obstacles, sjekker vi bare de få
+    tilene rect-en dekker. Vegger og dør-blockers er tile-store og lagres som
+    en teller per tile; andre rects (f.eks. fra World.add_obstacle) legges i
+    bøtter per tile de dekker.
+
+    Public API:
+      - from_room(room): bygg indeks fra GridRoom-terreng (vegger).
+      - add_rect(rect) / remove_rect(rect): legg til/fjern en blokkerende rect.
+      - collides(rect): True hvis rect overlapper noe solid.
+      - is_blocked(gx, gy): som GridRoom.is_blocked, men med lukkede dører (for pathfinding).
+
+    Tiles utenfor rommet er IKKE solide (samme som den gamle obstacle-lista).
+    """
+
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        self.tile_size = constants.TILE_SIZE
+        # antall tile-store blockers per tile (vegg + lukket dør kan overlappe)
+        self._solid = bytearray(cols * rows)
+        # (gx, gy) -> [pygame.Rect, ...] for rects som ikke er én hel tile
+        self._extra = {}
+
+    @classmethod
+    def from_room(cls, room):
+        grid = cls(room.cols, room.rows)
+        # kompilert terreng er allerede flatt: vegg → 1 blocker, gulv → 0
+        grid._solid = bytearray(t == constants.TILE_WALL for t in room.tiles)
+        return grid
+
+    @property
+    def solid(self):
+        """Rå tile-tellere (rows * cols, radvis), f.eks. for vektoriserte oppslag."""
+        return self._solid
+
+    @property
+    def has_extra(self):
+        """True hvis det finnes blockers som ikke er hele tiles."""
+        return bool(self._extra)
+
+    # ---------- oppdatering ----------
+    def add_rect(self, rect: pygame.Rect):
+        tile = self._whole_tile(rect)
+        if tile is not None:
+            self._solid[tile] += 1
+            return
+        for key in self._tiles_covered(rect):
+            self._extra.setdefault(key, []).append(rect)
+
+    def remove_rect(self, rect: pygame.Rect):
+        tile = self._whole_tile(rect)
+        if tile is not None:
+            if self._solid[tile]:
+                self._solid[tile] -= 1
+            return
+        for key in self._tiles_covered(rect):
+            bucket = self._extra.get(key)
+            if not bucket:
+                continue
+            for i, r in enumerate(bucket):
+                if r == rect:
+                    del bucket[i]
+                    break
+            if not bucket:
+                del self._extra[key]
+
+    # ---------- spørring ----------
+    def collides(self, rect: pygame.Rect) -> bool:
+        """Returner True hvis rect overlapper en solid tile eller en ekstra rect."""
+        if rect.width <= 0 or rect.height <= 0:
+            return False
+        T = self.tile_size
+        gx0, gx1 = rect.left // T, (rect.right - 1) // T
+        gy0, gy1 = rect.top // T, (rect.bottom - 1) // T
+        cols, rows = self.cols, self.rows
+        solid = self._solid
+        extra = self._extra
+
+        for gy in range(gy0, gy1 + 1):
+            in_rows = 0 <= gy < rows
+            for gx in range(gx0, gx1 + 1):
+                if in_rows and 0 <= gx < cols and solid[gy * cols + gx]:
+                    return True
+                if extra:
+                    bucket = extra.get((gx, gy))
+                    if bucket and rect.collidelist(bucket) != -1:
+                        return True
+        return False
+
+    def is_solid_tile(self, gx, gy) -> bool:
+        """True hvis tile (gx, gy) er blokkert av vegg eller tile-stor blocker."""
+        if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
+            return False
+        return self._solid[gy * self.cols + gx] > 0
+
+    def is_blocked(self, gx, gy) -> bool:
+        """Vegg, tile-stor blocker eller utenfor rommet (samme semantikk som GridRoom.is_blocked)."""
+        if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
+            return True
+        return self._solid[gy * self.cols + gx] > 0
+
+    # ---------- helpers ----------
+    def _whole_tile(self, rect):
+        """Indeks i _solid hvis rect er nøyaktig én tile i rommet, ellers None."""
+        T = self.tile_size
+        if rect.width != T or rect.height != T or rect.x % T or rect.y % T:
+            return None
+        gx, gy = rect.x // T, rect.y // T
+        if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
+            return None
+        return gy * self.cols + gx
+
+    def _tiles_covered(self, rect):
+        T = self.tile_size
+        for gy in range(rect.top // T, (rect.bottom - 1) // T + 1):
+            for gx in range(rect.left // T, (rect.right - 1) // T + 1):
+                yield (gx, gy)
@@ -1,3 +1,9 @@
+# simulering / løkke
+SIM_TICK_HZ             = 60                  # faste simulerings-ticks per sekund
+SIM_TICK_MS             = 1000 / SIM_TICK_HZ
+SIM_MAX_TICKS_PER_FRAME = 5                   # catch-up-grense per render-frame
+RENDER_FPS_CAP          = 60
+
 # colors
 BLACK  = (0, 0, 0)
 RED    = (255, 0, 0)
@@ -10,7 +16,7 @@ ORANGE = (255, 128, 0)
 PLAYER_COLOR = (255, 255, 255)
 
 # gameplay – player
-PLAYER_SPEED   = 5
+PLAYER_SPEED   = 5                       # px per simulerings-tick
 PLAYER_DPS     = 1
 PLAYER_HEALTH  = 5
 PLAYER_SIZE    = (50, 50)
@@ -32,6 +38,7 @@ ENEMY_SIZE         = (50, 50)
 ENEMY_ATTACK_COOLDOWN    = 500            # ms
 ENEMY_WANDER_INTERVAL_MS = (1200, 2500)   # (min, max) ms pause mellom impulser
 ENEMY_WANDER_RADIUS_TILES = 3             # hvor langt fra nåværende grid-rute
+ENEMY_SEPARATION_RADIUS  = 64            # px, radius for myk dytting mellom fiender
 
 # gameplay - door
 OPPOSITE = {"N":"S","S":"N","E":"W","W":"E"} # motsatt retning av der man kom inn
@@ -56,3 +63,25 @@ DEBUG_HITBOX_MS     = 120   # hvor lenge (ms) et angrep vises
 HITBOX_COLOR_RGBA   = (255, 60, 0, 120)   # semi-transparent oransje/rød
 HURTBOX_COLOR_RGBA  = (0, 200, 255, 80)   # semi-transparent cyan (om du vil vise hurtbox)
 
+# profilering (F3 slår av/på i spillet)
+PROFILE_ENABLED     = False
+PROFILE_FRAMES      = 600                 # ringbuffer-størrelse (frames)
+PROFILE_DUMP_PATH   = "profile.jsonl"     # skrives ved avslutning hvis profilering er på
+
+
+# AI-planlegging (AIScheduler)
+AI_THINK_BUDGET     = 48                  # maks budsjetterte tenk-kall per tick
+AI_TIME_BUDGET_MS   = None                # valgfritt tidsbudsjett (ms/tick); None = deterministisk
+AI_LOD_NEAR_PX      = 320                 # nærmere enn dette: tenk hver tick
+AI_LOD_MID_INTERVAL = 2                   # ticks mellom tenk innenfor DETECTION_RADIUS / i chase/search
+AI_LOD_FAR_INTERVAL = 6                   # ticks mellom tenk for fjerne fiender
+
+# navigasjon (HPA*)
+NAV_CLUSTER_SIZE    = 16                  # tiles per klynge-side
+NAV_HPA_MIN_TILES   = 2048                # rom med minst så mange tiles får HPA*-graf (search via PathCache/HPA*)
+NAV_FLOW_MIN_SEARCHERS = 4                # ... men mål som minst så mange fiender jakter får delt flow field
+
+# replay (opptak av input per tick)
+REPLAY_RECORD           = False           # ta opp input + state-hasher i main.py
+REPLAY_PATH             = "last_run.replay"
+REPLAY_CHECKPOINT_TICKS = 60              # state-hash hver N. tick
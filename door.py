@@ -4,7 +4,7 @@ import constants
 class Door:
     """
     Dør som kan åpnes/lukkes. Når lukket, legger vi inn en blokkerings-rect i obstacles.
-    Når åpen fjernes blokkerings-rect fra obstacles (gjøres av RoomManager).
+    Når åpen fjernes blokkerings-rect fra obstacles og kollisjonsindeksen (gjøres av RoomManager).
     """
     def __init__(self, rect: pygame.Rect, color_closed=(150, 50, 50), color_open=(50, 150, 50)):
         self.rect = rect
@@ -9,31 +9,40 @@ from collections import deque
 
 
 import constants
+from visibility import has_los
+from sim_clock import WallClock
 
 class Enemy():
     """
-    Enkel fiende-AI med tilstander, subpiksel-bevegelse, micro-wander og A* (neste-steg).
+    Enkel fiende-AI med tilstander, subpiksel-bevegelse, micro-wander og A*/flow field (neste-steg).
 
     Public API:
-      - move(player, obstacles, room, dt_ms): oppdaterer fienden ett frame.
+      - move(player, collision, room, dt_ms, flow_fields=None, visibility=None, defer_motion=False, paths=None):
+        oppdaterer fienden ett frame. World kaller den med defer_motion=True bare for
+        fiender som tenker denne ticken; alle fiender flyttes så samlet mot sitt
+        styremål av enemy_motion.move_enemies.
       - apply_separation(others, strength=..., radius=...): myk dytting for å redusere overlapping.
-      - draw(screen, camera): tegn fienden (inkl. valgfri debug-hitbox).
-      - Felter som andre systemer leser: rect, alive, health, state.
+      - draw(screen, camera, alpha=1.0): tegn fienden (inkl. valgfri debug-hitbox), interpolert mellom prev_pos og pos.
+      - Felter som andre systemer leser: rect, pos, prev_pos, alive, health, state.
 
     Alt som starter med '_' regnes som internt og kan endres uten varsel.
     """
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, clock=None, rng=None):
         """
         Opprett fiende.
 
         Args:
             x, y: startposisjon (piksel, øverste-venstre i rect)
-            width, height: størrelse på collider/tegning
+            clock: klokke med get_ticks() (WallClock/SimClock); default er pygame-tid
+            rng: random.Random (f.eks. World.rng.stream("enemy")); default er random-modulen
         """
+        self.clock = clock if clock is not None else WallClock()
+        self.rng = rng if rng is not None else random
         self.rect = pygame.Rect(x, y, *constants.ENEMY_SIZE)
         # Sann posisjon i float (senter), brukes til all bevegelse
         self.pos = Vector2(self.rect.center)
+        self.prev_pos = Vector2(self.pos)  # pos ved starten av siste tick (render-interpolasjon)
         
         # Combat & status
         self.health = constants.ENEMY_HEALTH
@@ -56,24 +65,45 @@ class Enemy():
 
         # Micro-wander (små tilfeldige steg når idle)
         self.wander_goal_g = None
-        now = pygame.time.get_ticks()
-        self.next_wander_at: int = now + random.randint(1200, 2500)
+        now = self.clock.get_ticks()
+        self.next_wander_at: int = now + self.rng.randint(1200, 2500)
         self.WANDER_INTERVAL_MS = constants.ENEMY_WANDER_INTERVAL_MS
         self.WANDER_RADIUS_TILES = constants.ENEMY_WANDER_RADIUS_TILES
 
+        # AI-LOD: neste tick fienden skal tenke (settes av AIScheduler)
+        self.ai_next_tick = 0
+        self._steer_target = None  # pikselmål fra siste move(); enemy_motion.move_enemies flytter mot det hver tick
+        self._defer_motion = False
+
+        # Lagret sti fra PathCache: tiles (start..mål), indeks vi står på, (mål, versjon, max_len)
+        self._path = None
+        self._path_i = 0
+        self._path_key = None
+
     # ------------------------- PUBLIC API -------------------------
 
-    def move(self, player, obstacles, room, dt_ms):
+    def move(self, player, collision, room, dt_ms, flow_fields=None, visibility=None, defer_motion=False, paths=None):
         """
         Oppdater fienden én frame: sansing, state-maskin, bevegelse, animasjon.
 
         Args:
             player: objekt med .rect (pygame.Rect)
-            obstacles: iterable av vegg-rektangler for kollisjon
+            collision: CollisionGrid (eller annet med .collides(rect)) for vegger/dører
             room: GridRoom med is_blocked(...) og TILE_SIZE
             dt_ms: millisekunder siden forrige frame (fra clock.tick)
+            flow_fields: valgfri FlowFieldCache delt av alle fiender i rommet;
+                         uten den (eller for mål den ikke dekker) brukes paths/A* i search
+            visibility: valgfri PlayerVisibility (spillerens synsfelt, delt av alle fiender);
+                        uten den gjøres Bresenham per fiende
+            defer_motion: True → bare sett styremålet; World flytter alle fiender
+                          samlet etterpå (enemy_motion.move_enemies). "Nådd mål"
+                          vurderes da fra posisjonen før flytten.
+            paths: valgfri PathCache; fienden lagrer hele stien og følger den
+                   (wander, og search som flow_fields ikke dekker) i stedet for å søke hver frame
         """
-        now = pygame.time.get_ticks()
+        now = self.clock.get_ticks()
+        self._steer_target = None
+        self._defer_motion = defer_motion
 
         # Død short-circuit
         if self.health <= 0:
@@ -101,7 +131,11 @@ class Enemy():
         enemy_center = self.rect.center
         see_player = False
         if self._dist2(*player_center, *enemy_center) <= constants.DETECTION_RADIUS * constants.DETECTION_RADIUS:            
-            if self._has_los(room, *self._grid_pos(), *player._grid_pos()):
+            if visibility is not None:
+                has_sight = visibility.can_see(self._grid_pos())
+            else:
+                has_sight = self._has_los(room, *self._grid_pos(), *player._grid_pos())
+            if has_sight:
                 see_player = True
                 self.last_seen_pos = player_center
                 self.search_started = None
@@ -113,10 +147,13 @@ class Enemy():
             else:
                 # Micro-wander
                 if self.wander_goal_g is not None:
-                    next_tile_g = self._micro_wander(room, self.wander_goal_g, self.WANDER_RADIUS_TILES)
+                    if paths is not None:
+                        next_tile_g = self._path_next_step(paths, room, self.wander_goal_g, self.WANDER_RADIUS_TILES)
+                    else:
+                        next_tile_g = self._micro_wander(room, self.wander_goal_g, self.WANDER_RADIUS_TILES)
                     if next_tile_g:
                         target_px = self._center_of_tile(*next_tile_g)
-                        wander_end = self._move_towards(target_px, obstacles, dt_ms)
+                        wander_end = self._move_towards(target_px, collision, dt_ms)
                     else:
                         wander_end = True  
 
@@ -124,7 +161,7 @@ class Enemy():
                     
                     if wander_end or (gx, gy) == self.wander_goal_g:
                         self.wander_goal_g = None
-                        wait = random.randint(*self.WANDER_INTERVAL_MS)
+                        wait = self.rng.randint(*self.WANDER_INTERVAL_MS)
                         self.next_wander_at = now + wait
                         
                 elif now >= self.next_wander_at:
@@ -133,13 +170,13 @@ class Enemy():
                     if goal and goal != start_g:
                         self.wander_goal_g = goal
                     else:
-                        wait = random.randint(*self.WANDER_INTERVAL_MS)
+                        wait = self.rng.randint(*self.WANDER_INTERVAL_MS)
                         self.next_wander_at = now + wait
 
         elif self.state == "chase":
             self.wander_goal_g = None
             if see_player:
-                self._move_towards(player_center, obstacles, dt_ms)
+                self._move_towards(player_center, collision, dt_ms)
                 
                 if now >= self.attack_cooldown_until and self._dist2(*player_center, *enemy_center) <= constants.ATTACK_RANGE * constants.ATTACK_RANGE:
                     self.state = "attack"
@@ -158,19 +195,24 @@ class Enemy():
             self.attack_cooldown_until = now + constants.ENEMY_ATTACK_COOLDOWN
 
         elif self.state == "search":
-            # Gå mot siste kjente posisjon via grid (A* neste-steg)
+            # Gå mot siste kjente posisjon via grid (flow field / A* neste-steg)
             if see_player:
                 self.state = "chase"
             elif self.last_seen_pos:
                 T = constants.TILE_SIZE
                 goal_g = (self.last_seen_pos[0] // T, self.last_seen_pos[1] // T)
-                next_tile_g = self._astar_next_step(room, goal_g, max_expansions=512)
+                if flow_fields is not None and flow_fields.covers(goal_g):
+                    next_tile_g = flow_fields.next_step(room, self._grid_pos(), goal_g)
+                elif paths is not None:
+                    next_tile_g = self._path_next_step(paths, room, goal_g)
+                else:
+                    next_tile_g = self._astar_next_step(room, goal_g, max_expansions=512)
                 if next_tile_g:
                     target_px = self._center_of_tile(*next_tile_g)
-                    reached = self._move_towards(target_px, obstacles, dt_ms)
+                    reached = self._move_towards(target_px, collision, dt_ms)
                 else:
                     # fallback: forsøk rett mot pikselpos (kan kile, men holder ting i bevegelse)
-                    reached = self._move_towards(self.last_seen_pos, obstacles, dt_ms)
+                    reached = self._move_towards(self.last_seen_pos, collision, dt_ms)
 
                 timedout = self.search_started and (now - self.search_started > constants.LOSE_SIGHT_TIME)
                 if reached or timedout:
@@ -183,15 +225,21 @@ class Enemy():
         elif self.state == "dead":
             return
         
-    def draw(self, screen, camera):
+    def draw(self, screen, camera, alpha=1.0):
         """
         Tegn fienden og (valgfritt) en semitransparent debug-hitbox for angrep.
 
         Args:
             screen: pygame-surface
             camera: objekt med .apply(rect) -> rect (for world->screen transform)
+            alpha: 0..1 mellom prev_pos og pos (FixedTimestep.alpha); 1 = nåværende tick
         """
-        draw_rect = camera.apply(self.rect)
+        rect = self.rect
+        if alpha < 1.0:
+            prev, pos = self.prev_pos, self.pos
+            rect = rect.copy()
+            rect.center = (round(prev.x + (pos.x - prev.x) * alpha), round(prev.y + (pos.y - prev.y) * alpha))
+        draw_rect = camera.apply(rect)
 
         # enkel fargekode per state (nyttig for debugging/lesbarhet)
         if self.state == "idle":    color = (0, 180, 0)
@@ -205,7 +253,7 @@ class Enemy():
         pygame.draw.rect(screen, color, draw_rect)
 
         if constants.DEBUG_SHOW_HITBOXES and self.debug_attack_rect:
-            if pygame.time.get_ticks() <= self.debug_attack_until:
+            if self.clock.get_ticks() <= self.debug_attack_until:
                 surf = pygame.Surface(
                     (self.debug_attack_rect.width, self.debug_attack_rect.height),
                     pygame.SRCALPHA
@@ -219,31 +267,8 @@ class Enemy():
     # ------------------------- INTERN LOGIKK -------------------------
     
     def _has_los(self, room, enemy_x, enemy_y, player_x, player_y):
-        """
-        Line-of-sight på GRID (Bresenham).
-        Alle koordinater er grid (tiles), ikke piksler.
-        Returnerer True hvis linjen fra (enemy_x, enemy_y) til (player_x, player_y)
-        ikke passerer noen blokkerte tiles.
-        """
-        dx = abs(player_x - enemy_x)
-        dy = -abs(player_y - enemy_y)
-        x_steps = 1 if enemy_x < player_x else -1
-        y_steps = 1 if enemy_y < player_y else -1
-        err = dx + dy
-
-        x, y = enemy_x, enemy_y
-        while True:
-            if (x, y) != (enemy_x, enemy_y) and room.is_blocked(x, y):
-                return False
-            if x == player_x and y == player_y:
-                return True 
-            e2 = 2 * err
-            if e2 >= dy:
-                err += dy
-                x += x_steps
-            if e2 <= dx:
-                err += dx
-                y += y_steps
+        """Line-of-sight på GRID (Bresenham), se visibility.has_los."""
+        return has_los(room, enemy_x, enemy_y, player_x, player_y)
                 
     def _grid_pos(self):
         """Returner grid-koordinat (gx, gy) basert på TILE_SIZE."""
@@ -265,14 +290,11 @@ class Enemy():
         T = constants.TILE_SIZE
         return (gx * T + T // 2, gy * T + T // 2)
 
-    def check_collision(self, obstacles):
-        """Returner True hvis self.rect kolliderer med et av obstacles."""
-        for obstacle in obstacles:
-            if self.rect.colliderect(obstacle):
-                return True
-        return False
+    def check_collision(self, collision):
+        """Returner True hvis self.rect kolliderer med noe solid i collision."""
+        return collision.collides(self.rect)
 
-    def _slide_move(self, vx, vy, dt_ms, obstacles):
+    def _slide_move(self, vx, vy, dt_ms, collision):
         dt = dt_ms / 1000.0
         dx_total = vx * dt
         dy_total = vy * dt
@@ -285,7 +307,7 @@ class Enemy():
             if sdx:
                 self.pos.x += sdx
                 self._sync_rect_from_pos()
-                if self.check_collision(obstacles):
+                if self.check_collision(collision):
                     self.pos.x -= sdx
                     self._sync_rect_from_pos()
                     # ev. snap + EPS her
@@ -293,23 +315,26 @@ class Enemy():
             if sdy:
                 self.pos.y += sdy
                 self._sync_rect_from_pos()
-                if self.check_collision(obstacles):
+                if self.check_collision(collision):
                     self.pos.y -= sdy
                     self._sync_rect_from_pos()
                     # ev. snap + EPS her
 
-    def _move_towards(self, target_px, obstacles, dt_ms):
+    def _move_towards(self, target_px, collision, dt_ms):
         """
         Gå mot en piksel-posisjon med normalisert fart.
 
         Returnerer:
             True hvis vi er 'nær nok' målet (≤ 24 px), ellers False.
         """
+        self._steer_target = target_px
+        if self._defer_motion:
+            return self._dist2(int(self.pos.x), int(self.pos.y), int(target_px[0]), int(target_px[1])) <= (24 * 24)
         direction = Vector2(target_px[0] - self.pos.x, target_px[1] - self.pos.y)
         dist = direction.length()
         if dist > 1e-6:
             direction /= dist  # normaliser
-            self._slide_move(direction.x * self.speed, direction.y * self.speed, dt_ms, obstacles)
+            self._slide_move(direction.x * self.speed, direction.y * self.speed, dt_ms, collision)
         return self._dist2(int(self.pos.x), int(self.pos.y), int(target_px[0]), int(target_px[1])) <= (24 * 24)
     
     def _apply_separation(self, others):
@@ -322,7 +347,7 @@ class Enemy():
             radius: påvirkningsradius (px)
         """
         strength=0.08
-        radius=64
+        radius=constants.ENEMY_SEPARATION_RADIUS
         self_x, self_y = self.pos.x, self.pos.y
         pushx = pushy = 0.0
         r2 = float(radius * radius)
@@ -354,12 +379,37 @@ class Enemy():
         tries = 7
         cx, cy = center_g
         for _ in range(tries):
-            nx = cx + random.randint(-radius, radius)
-            ny = cy + random.randint(-radius, radius)
+            nx = cx + self.rng.randint(-radius, radius)
+            ny = cy + self.rng.randint(-radius, radius)
             if not room.is_blocked(nx, ny):
                 return (nx, ny)
         return None
 
+    def _path_next_step(self, paths, room, goal_g, max_len=None):
+        """
+        Neste grid-steg langs lagret sti mot goal_g (None på mål / ingen rute).
+
+        Stien følges så lenge målet og PathCache-versjonen er de samme og vi står
+        på (eller ett steg videre på) stien; ellers hentes en ny fra cachen.
+        """
+        start = self._grid_pos()
+        path = self._path
+        if path is not None and self._path_key == (goal_g, paths.version, max_len):
+            i = self._path_i
+            if i + 1 < len(path) and path[i + 1] == start:
+                i += 1
+            if path[i] == start:
+                self._path_i = i
+                return path[i + 1] if i + 1 < len(path) else None
+
+        path = paths.path(room, start, goal_g, max_len)
+        self._path = path
+        self._path_i = 0
+        self._path_key = (goal_g, paths.version, max_len)
+        if path is None or len(path) < 2:
+            return None
+        return path[1]
+
     def _micro_wander(self, room, goal_g, max_depth):
         """
         BFS: finn NESTE grid-steg fra nåværende pos mot goal_g (billig og robust).
@@ -504,4 +554,4 @@ class Enemy():
 
         if constants.DEBUG_SHOW_HITBOXES:
             self.debug_attack_rect = atk
-            self.debug_attack_until = pygame.time.get_ticks() + constants.DEBUG_HITBOX_MS
+            self.debug_attack_until = self.clock.get_ticks() + constants.DEBUG_HITBOX_MS
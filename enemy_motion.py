@@ -0,0 +1,102 @@
+import numpy as np
+import pygame
+
+# samme terskel som Enemy._move_towards (px²)
+REACHED_DIST2 = 24 * 24
+
+def move_enemies(enemies, collision, dt_ms):
+    """
+    Flytt alle fiender mot sitt styremål (Enemy._steer_target) samtidig.
+
+    Samme bevegelse som Enemy._move_towards/_slide_move, men som arrays:
+    normalisert fart mot målet, delsteg på maks ~4 px, og per delsteg først
+    x-aksen, så y-aksen; en akse som gir kollisjon rulles tilbake (sliding).
+    Vegg-/dør-testen mot tile-gridet gjøres for alle fiender på én gang.
+
+    Skriver tilbake pos og rect, og nuller _steer_target for fiender som er
+    innenfor 24 px av målet etter flytten (som Enemy._move_towards). Fiender
+    som ikke tenker denne ticken (AIScheduler) beholder målet og flyttes videre
+    mot det her.
+    """
+    movers = [e for e in enemies if e._steer_target is not None and e.health > 0]
+    n = len(movers)
+    if not n:
+        return
+
+    data = np.array(
+        [(e.pos.x, e.pos.y, e._steer_target[0], e._steer_target[1], e.speed) for e in movers],
+        dtype=np.float64,
+    )
+    px, py = data[:, 0].copy(), data[:, 1].copy()
+    tx, ty, speed = data[:, 2], data[:, 3], data[:, 4]
+    w, h = movers[0].rect.size  # alle fiender har ENEMY_SIZE
+
+    # ønsket fart (som Vector2: normaliser bare hvis lengden > 1e-6)
+    dx, dy = tx - px, ty - py
+    dist = np.sqrt(dx * dx + dy * dy)
+    moving = dist > 1e-6
+    inv = 1.0 / np.where(moving, dist, 1.0)  # Vector2 /= d ganger med 1/d
+    dt = dt_ms / 1000.0
+    dx_total = np.where(moving, dx * inv * speed * dt, 0.0)
+    dy_total = np.where(moving, dy * inv * speed * dt, 0.0)
+
+    steps = np.maximum(1, np.floor(np.maximum(np.abs(dx_total), np.abs(dy_total)) / 4)).astype(np.int64)
+    sdx = dx_total / steps
+    sdy = dy_total / steps
+
+    for s in range(int(steps.max()) if moving.any() else 0):
+        active = moving & (steps > s)
+        m = active & (sdx != 0)
+        if m.any():
+            px[m] += sdx[m]
+            hit = m & _collides(collision, px, py, w, h, m)
+            px[hit] -= sdx[hit]
+        m = active & (sdy != 0)
+        if m.any():
+            py[m] += sdy[m]
+            hit = m & _collides(collision, px, py, w, h, m)
+            py[hit] -= sdy[hit]
+
+    reached = (np.trunc(px) - np.trunc(tx)) ** 2 + (np.trunc(py) - np.trunc(ty)) ** 2 <= REACHED_DIST2
+    cx, cy = np.rint(px).astype(np.int64), np.rint(py).astype(np.int64)
+    for i, e in enumerate(movers):
+        e.pos.x = px[i]
+        e.pos.y = py[i]
+        e.rect.center = (int(cx[i]), int(cy[i]))
+        if reached[i]:
+            e._steer_target = None
+
+# ---------- helpers ----------
+
+def _collides(collision, px, py, w, h, mask):
+    """Bool per fiende: rect (sentrert i rint(pos)) overlapper noe solid. Bare rader i mask testes."""
+    idx = np.nonzero(mask)[0]
+    hit = np.zeros(len(px), dtype=bool)
+    left = np.rint(px[idx]).astype(np.int64) - w // 2
+    top = np.rint(py[idx]).astype(np.int64) - h // 2
+
+    T = collision.tile_size
+    cols, rows = collision.cols, collision.rows
+    sub = np.zeros(len(idx), dtype=bool)
+    if cols and rows:
+        solid = np.frombuffer(collision.solid, dtype=np.uint8).reshape(rows, cols)
+        gx0, gx1 = left // T, (left + w - 1) // T
+        gy0, gy1 = top // T, (top + h - 1) // T
+        # rect dekker maks ceil(w/T)+1 tiles per akse
+        for ox in range(-(-w // T) + 1):
+            gx = np.minimum(gx0 + ox, gx1)
+            for oy in range(-(-h // T) + 1):
+                gy = np.minimum(gy0 + oy, gy1)
+                inside = (gx >= 0) & (gy >= 0) & (gx < cols) & (gy < rows)
+                sub[inside] |= solid[gy[inside], gx[inside]] > 0
+
+    # rects som ikke er hele tiles: per fiende (sjeldent)
+    if collision.has_extra:
+        box = pygame.Rect(0, 0, w, h)
+        for j in np.nonzero(~sub)[0]:
+            box.x, box.y = int(left[j]), int(top[j])
+            if collision.collides(box):
+                sub[j] = True
+
+    hit[idx] = sub
+    return hit
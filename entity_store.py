@@ -0,0 +1,131 @@
+SLOT_BITS = 24
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+class EntityStore:
+    """
+    Tett entitetsliste med O(1) fjerning og stabile håndtak.
+
+    Entitetene ligger tett i en liste (rask iterasjon). Fjerning er utsatt:
+    discard() markerer, og flush() på slutten av ticken gjør swap-remove
+    (siste element flyttes inn i hullet), så det er trygt å fjerne mens man
+    itererer og ingen kopi av lista trengs.
+
+    Hver entitet får et heltalls-håndtak (obj.handle) = (generasjon << 24) | slot.
+    Slotten gjenbrukes etter fjerning, men generasjonen økes, så get(handle)
+    på et gammelt håndtak gir None i stedet for feil entitet.
+
+    NB: swap-remove endrer rekkefølgen på gjenværende entiteter.
+
+    layout()/restore_layout() henter ut og setter tilbake slot-tabellene, så
+    et snapshot (snapshot.py) gir samme håndtak og samme rekkefølge etter restore.
+    """
+
+    def __init__(self):
+        self._items = []      # tett: entitetene
+        self._slots = []      # tett indeks -> slot
+        self._dense = []      # slot -> tett indeks (-1 = ledig)
+        self._gen = []        # slot -> generasjon
+        self._free = []       # ledige slots
+        self._pending = []    # slots som skal fjernes ved flush()
+        self._pending_set = set()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, obj):
+        return self.get(getattr(obj, "handle", None)) is obj
+
+    # ---------- oppdatering ----------
+    def add(self, obj):
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self._dense)
+            self._dense.append(-1)
+            self._gen.append(0)
+        self._dense[slot] = len(self._items)
+        self._items.append(obj)
+        self._slots.append(slot)
+        obj.handle = (self._gen[slot] << SLOT_BITS) | slot
+        return obj.handle
+
+    def discard(self, obj):
+        """Merk obj for fjerning ved neste flush() (idempotent)."""
+        handle = getattr(obj, "handle", None)
+        if self.get(handle) is not obj:
+            return
+        slot = handle & SLOT_MASK
+        if slot not in self._pending_set:
+            self._pending_set.add(slot)
+            self._pending.append(slot)
+
+    def flush(self):
+        """Fjern alle markerte entiteter med swap-remove."""
+        if not self._pending:
+            return
+        items, slots, dense = self._items, self._slots, self._dense
+        for slot in self._pending:
+            i = dense[slot]
+            last = len(items) - 1
+            if i != last:
+                moved_slot = slots[last]
+                items[i] = items[last]
+                slots[i] = moved_slot
+                dense[moved_slot] = i
+            items.pop()
+            slots.pop()
+            dense[slot] = -1
+            self._gen[slot] += 1
+            self._free.append(slot)
+        self._pending.clear()
+        self._pending_set.clear()
+
+    def remove(self, obj):
+        """Fjern obj med en gang (ikke mens man itererer over lageret)."""
+        self.discard(obj)
+        self.flush()
+
+    def clear(self):
+        # øk generasjonene så gamle håndtak blir ugyldige
+        for slot in self._slots:
+            self._dense[slot] = -1
+            self._gen[slot] += 1
+            self._free.append(slot)
+        self._items.clear()
+        self._slots.clear()
+        self._pending.clear()
+        self._pending_set.clear()
+
+    def layout(self):
+        """(slots, gen, free) som lister – tas mellom ticks (etter flush())."""
+        if self._pending:
+            raise RuntimeError("EntityStore.layout() med uflushede fjerninger")
+        return list(self._slots), list(self._gen), list(self._free)
+
+    def restore_layout(self, items, slots, gen, free):
+        """Sett lageret til items (tett rekkefølge) med slot-tabeller fra layout()."""
+        self._items[:] = items
+        self._slots[:] = slots
+        self._gen[:] = gen
+        self._free[:] = free
+        dense = [-1] * len(gen)
+        for i, slot in enumerate(slots):
+            dense[slot] = i
+            items[i].handle = (gen[slot] << SLOT_BITS) | slot
+        self._dense = dense
+        self._pending.clear()
+        self._pending_set.clear()
+
+    # ---------- oppslag ----------
+    def get(self, handle):
+        """Entiteten for handle, eller None hvis den er fjernet/håndtaket er gammelt."""
+        if handle is None:
+            return None
+        slot = handle & SLOT_MASK
+        if slot >= len(self._dense) or self._gen[slot] != handle >> SLOT_BITS:
+            return None
+        i = self._dense[slot]
+        return self._items[i] if i >= 0 else None
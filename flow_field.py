@@ -0,0 +1,127 @@
+from collections import deque, OrderedDict
+
+# Samme naborekkefølge som Enemy._astar_next_step (lik tie-break)
+DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+UNREACHABLE = -1
+
+class FlowField:
+    """
+    Avstandskart (BFS = Dijkstra med enhetskost, 4-retninger) fra én mål-tile.
+
+    dist[gy * cols + gx] = antall steg til målet, eller UNREACHABLE.
+    Neste steg fra en tile er naboen med lavest avstand → O(1) per fiende.
+
+    is_blocked(gx, gy) avgjør hvilke tiles som er vegg; standard er
+    room.is_blocked (bare terreng), FlowFieldCache sender inn CollisionGrid
+    sin så lukkede dører også regnes med.
+    """
+
+    def __init__(self, room, goal_g, is_blocked=None):
+        self.room = room
+        self.goal = goal_g
+        self.cols = room.cols
+        self.rows = room.rows
+        self.dist = self._compute(is_blocked or room.is_blocked, goal_g)
+
+    def distance(self, gx, gy):
+        if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
+            return UNREACHABLE
+        return self.dist[gy * self.cols + gx]
+
+    def next_step(self, start_g):
+        """Returner (gx, gy) for neste steg mot målet, eller None (på mål / ingen rute)."""
+        sx, sy = start_g
+        d = self.distance(sx, sy)
+        if d <= 0:
+            return None
+        for dx, dy in DIRS:
+            nx, ny = sx + dx, sy + dy
+            if self.distance(nx, ny) == d - 1:
+                return (nx, ny)
+        return None
+
+    def _compute(self, is_blocked, goal_g):
+        cols, rows = self.cols, self.rows
+        dist = [UNREACHABLE] * (cols * rows)
+        gx, gy = goal_g
+        if is_blocked(gx, gy):
+            return dist
+
+        dist[gy * cols + gx] = 0
+        q = deque([goal_g])
+        while q:
+            x, y = q.popleft()
+            nd = dist[y * cols + x] + 1
+            for dx, dy in DIRS:
+                nx, ny = x + dx, y + dy
+                if nx < 0 or ny < 0 or nx >= cols or ny >= rows:
+                    continue
+                i = ny * cols + nx
+                if dist[i] != UNREACHABLE or is_blocked(nx, ny):
+                    continue
+                dist[i] = nd
+                q.append((nx, ny))
+        return dist
+
+
+class FlowFieldCache:
+    """
+    Delte flow fields per rom, nøklet på mål-tile.
+
+    Fiender i 'search' jakter stort sett samme tile (der spilleren sist ble sett),
+    så et felt regnes ut én gang per mål og gjenbrukes av alle fiendene.
+    Byttes rommet, kastes alle feltene.
+
+    Med collision (CollisionGrid, satt av World) er lukkede dører vegg, både i
+    BFS-en og i next_step; åpnes/lukkes dørene, må clear() kalles (RoomManager).
+
+    shared begrenser hvilke mål som dekkes: None = alle (små rom), ellers et
+    sett med mål-tiles som nok fiender jakter samtidig (World setter det i rom
+    med HPA*-graf). covers(goal_g) False → fienden søker selv via PathCache/HPA*,
+    i stedet for at én fiende betaler en BFS over hele det store rommet.
+    """
+
+    def __init__(self, max_fields=8):
+        self.max_fields = max_fields
+        self.shared = None
+        self.collision = None
+        self._room = None
+        self._fields = OrderedDict()  # goal_g -> FlowField (LRU)
+
+    def clear(self):
+        self._room = None
+        self._fields.clear()
+
+    def field(self, room, goal_g):
+        self._use_room(room)
+
+        f = self._fields.get(goal_g)
+        if f is None:
+            f = FlowField(room, goal_g, self._is_blocked(room))
+            self._fields[goal_g] = f
+            if len(self._fields) > self.max_fields:
+                self._fields.popitem(last=False)
+        else:
+            self._fields.move_to_end(goal_g)
+        return f
+
+    def covers(self, goal_g):
+        return self.shared is None or goal_g in self.shared
+
+    def next_step(self, room, start_g, goal_g):
+        """Neste grid-steg fra start_g mot goal_g, eller None (som _astar_next_step)."""
+        is_blocked = self._is_blocked(room)
+        if start_g == goal_g or is_blocked(*start_g) or is_blocked(*goal_g):
+            return None
+        # Ingen rute (annet område) → None, kalleren går rett mot målet
+        return self.field(room, goal_g).next_step(start_g)
+
+    # ---------- helpers ----------
+    def _is_blocked(self, room):
+        return self.collision.is_blocked if self.collision is not None else room.is_blocked
+
+    def _use_room(self, room):
+        if room is not self._room:
+            self.clear()
+            self._room = room
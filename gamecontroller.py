@@ -1,11 +1,43 @@
 import pygame
 import constants
 
-def player_input(player, obstacles, world, camera):
+class InputState:
+    """
+    Input for én frame, uavhengig av pygame sine event-/tastatur-APIer.
+
+    up/down/left/right: bevegelsestaster (W/S/A/D)
+    aim: sikte i world-koordinater (x, y)
+    fire: venstre museknapp
+    """
+    def __init__(self, up=False, down=False, left=False, right=False, aim=(0, 0), fire=False):
+        self.up = up
+        self.down = down
+        self.left = left
+        self.right = right
+        self.aim = aim
+        self.fire = fire
+
+def read_input(camera):
+    """Les tastatur og mus fra pygame (krever display)."""
     keys = pygame.key.get_pressed()
-    now = pygame.time.get_ticks()
     mouse_pos_screen = pygame.mouse.get_pos()
     mouse_pos_world = camera.screen_to_world(mouse_pos_screen)
+    mouse_buttons = pygame.mouse.get_pressed()
+    return InputState(
+        up=keys[pygame.K_w],
+        down=keys[pygame.K_s],
+        left=keys[pygame.K_a],
+        right=keys[pygame.K_d],
+        aim=(mouse_pos_world[0], mouse_pos_world[1]),
+        fire=mouse_buttons[0],
+    )
+
+def player_input(player, collision, world, camera):
+    apply_input(player, collision, world, read_input(camera))
+
+def apply_input(player, collision, world, inp):
+    """Bruk ett frames InputState på spilleren (fungerer headless)."""
+    now = world.clock.get_ticks()
 
     # init debug felter hvis de ikke finnes
     if not hasattr(player, "attack_timer"):
@@ -17,36 +49,32 @@ def player_input(player, obstacles, world, camera):
 
     # --- bevegelse ---
     old_x, old_y = player.rect.x, player.rect.y
-    if keys[pygame.K_w]:
+    if inp.up:
         player.rect.y -= player.speed
-        if _collides(player, obstacles): player.rect.y = old_y
-    if keys[pygame.K_s]:
+        if _collides(player, collision): player.rect.y = old_y
+    if inp.down:
         player.rect.y += player.speed
-        if _collides(player, obstacles): player.rect.y = old_y
-    if keys[pygame.K_a]:
+        if _collides(player, collision): player.rect.y = old_y
+    if inp.left:
         player.rect.x -= player.speed
-        if _collides(player, obstacles): player.rect.x = old_x
-    if keys[pygame.K_d]:
+        if _collides(player, collision): player.rect.x = old_x
+    if inp.right:
         player.rect.x += player.speed
-        if _collides(player, obstacles): player.rect.x = old_x
+        if _collides(player, collision): player.rect.x = old_x
 
     # --- cooldown slutt? ---
     if now > player.attack_cooldown:
         player.playerAttack = False
 
     # --- skyting ---
-    mouse_buttons = pygame.mouse.get_pressed()
-
-    if mouse_buttons[0] and now >= player.attack_cooldown:
+    if inp.fire and now >= player.attack_cooldown:
         direction = pygame.math.Vector2(
-            mouse_pos_world[0] - player.rect.centerx,
-            mouse_pos_world[1] - player.rect.centery
+            inp.aim[0] - player.rect.centerx,
+            inp.aim[1] - player.rect.centery
         )
-    
+
         if direction.length_squared() > 0:
-            from projectile import Projectile
-            proj = Projectile(player.rect.center, direction)
-            world.projectiles.append(proj)
+            world.projectiles.spawn(player.rect.center, direction)
 
             player.attack_cooldown = now + constants.PLAYER_ATTACK_COOLDOWN
 
@@ -54,8 +82,5 @@ def player_input(player, obstacles, world, camera):
     if player.health <= 0:
         player.alive = False
 
-def _collides(player, obstacles):
-    for obs in obstacles:
-        if player.rect.colliderect(obs):
-            return True
-    return False
+def _collides(player, collision):
+    return collision.collides(player.rect)
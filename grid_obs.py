@@ -0,0 +1,223 @@
+import numpy as np
+
+import constants
+
+# Kanaler i observasjonen (rekkefølge = indeks i tensoren)
+CHANNELS = (
+    "wall",          # vegg-tile eller utenfor rommet
+    "door_closed",
+    "door_open",
+    "enemy",         # antall fiender med senter i tilen
+    "enemy_chase",   # ... av dem i chase/attack
+    "enemy_search",  # ... av dem i search
+    "projectile",    # antall kuler
+    "powerup",
+    "buff_speed",    # gjenværende andel av buffens varighet (hele planet)
+    "buff_attack",
+    "buff_shield",
+)
+_STATIC = 3  # wall, door_closed, door_open
+
+# planer i TileOccupancy.grid
+ENEMY, ENEMY_CHASE, ENEMY_SEARCH, PROJECTILE, POWERUP = range(5)
+_STATE_PLANE = {"chase": ENEMY_CHASE, "attack": ENEMY_CHASE, "search": ENEMY_SEARCH}
+
+_BUFFS = ("speed_boost", "attack_boost", "shield_boost")
+
+
+class TileOccupancy:
+    """
+    Tellere per tile for fiender (totalt og per state), kuler og powerups i nåværende rom.
+
+    Holdes ved like av World når world.occupancy er satt, der World uansett
+    rører entitetene: fiender ved spawn, etter flytt/separasjon og ved død,
+    powerups ved spawn/plukk, kuler vektorisert etter ProjectileSystem.update.
+    En fiende som blir på samme tile i samme state koster bare en
+    sammenligning; bare tiles som faktisk endres skrives.
+
+    Gridet har pad tiles kant rundt rommet, så et utsnitt rundt spilleren er en ren slice.
+
+    Public API:
+      - grid: int16 (5, rows + 2*pad, cols + 2*pad) – ENEMY, ENEMY_CHASE, ENEMY_SEARCH, PROJECTILE, POWERUP.
+      - room: rommet gridet gjelder for.
+      - reset(room): tomt grid for rommet (rombytte / World.clear).
+      - resync(world): bygg alt på nytt fra world (f.eks. etter snapshot.restore).
+      - enemy_moved(e), enemy_removed(e), powerup_added(pu), powerup_removed(pu),
+        projectiles_moved(system): hendelser fra World.
+    """
+
+    def __init__(self, pad):
+        self.pad = pad
+        self.room = None
+        self.cols = self.rows = 0
+        self.grid = np.zeros((5, 2 * pad, 2 * pad), dtype=np.int16)
+        self._flat = self.grid.reshape(5, -1)
+        self._enemies = {}                      # handle -> (flat tile, state-plan eller -1)
+        self._projectiles = np.zeros(0, dtype=np.intp)   # flat tile per kule ved forrige oppdatering
+
+    # ---------- oppbygging ----------
+    def reset(self, room):
+        self.room = room
+        self.cols, self.rows = (room.cols, room.rows) if room is not None else (0, 0)
+        shape = (5, self.rows + 2 * self.pad, self.cols + 2 * self.pad)
+        if self.grid.shape != shape:
+            self.grid = np.zeros(shape, dtype=np.int16)
+            self._flat = self.grid.reshape(5, -1)
+        else:
+            self.grid.fill(0)
+        self._enemies.clear()
+        self._projectiles = np.zeros(0, dtype=np.intp)
+
+    def resync(self, world):
+        self.reset(getattr(world, "current_room", None))
+        for e in world.enemies:
+            self.enemy_moved(e)
+        for pu in world.powerups:
+            self.powerup_added(pu)
+        self.projectiles_moved(world.projectiles)
+
+    # ---------- hendelser ----------
+    def enemy_moved(self, e):
+        new = (self._cell(e.pos.x, e.pos.y), _STATE_PLANE.get(e.state, -1))
+        old = self._enemies.get(e.handle)
+        if old == new:
+            return
+        if old is not None:
+            self._count(old, -1)
+        self._enemies[e.handle] = new
+        self._count(new, 1)
+
+    def enemy_removed(self, e):
+        old = self._enemies.pop(e.handle, None)
+        if old is not None:
+            self._count(old, -1)
+
+    def powerup_added(self, pu):
+        cell = self._cell(*pu.rect.center)
+        if cell >= 0:
+            self._flat[POWERUP, cell] += 1
+
+    def powerup_removed(self, pu):
+        cell = self._cell(*pu.rect.center)
+        if cell >= 0:
+            self._flat[POWERUP, cell] -= 1
+
+    def projectiles_moved(self, system):
+        plane = self._flat[PROJECTILE]
+        if self._projectiles.size:
+            np.subtract.at(plane, self._projectiles, 1)
+        n = system.count
+        if not n:
+            self._projectiles = np.zeros(0, dtype=np.intp)
+            return
+        g = (system.pos[:n] // constants.TILE_SIZE).astype(np.intp) + self.pad
+        w, h = self.cols + 2 * self.pad, self.rows + 2 * self.pad
+        inside = (g[:, 0] >= 0) & (g[:, 1] >= 0) & (g[:, 0] < w) & (g[:, 1] < h)
+        idx = g[inside, 1] * w + g[inside, 0]
+        np.add.at(plane, idx, 1)
+        self._projectiles = idx
+
+    # ---------- helpers ----------
+    def _cell(self, x, y):
+        """Flat indeks i det paddede gridet for pikselpos (x, y), eller -1 utenfor."""
+        T = constants.TILE_SIZE
+        gx = int(x) // T + self.pad
+        gy = int(y) // T + self.pad
+        w = self.cols + 2 * self.pad
+        if gx < 0 or gy < 0 or gx >= w or gy >= self.rows + 2 * self.pad:
+            return -1
+        return gy * w + gx
+
+    def _count(self, entry, d):
+        cell, plane = entry
+        if cell < 0:
+            return
+        self._flat[ENEMY, cell] += d
+        if plane >= 0:
+            self._flat[plane, cell] += d
+
+
+class GridObservation:
+    """
+    Flerkanals grid-tensor (CHANNELS × (2r+1) × (2r+1)) sentrert på spillerens tile.
+
+    Terreng og dører bygges én gang per rom (og dør-tilene skrives om når
+    dørene åpnes/lukkes); fiender, kuler og powerups telles inkrementelt av
+    TileOccupancy, som kobles på world.occupancy. observe() er derfor bare
+    to slices og tre fyll for buff-planene, uansett antall entiteter.
+
+    Utenfor rommet er "wall" 1. Står spilleren utenfor rommet, sentreres
+    utsnittet på nærmeste tile i rommet.
+
+    Public API:
+      - observe(out=None) -> float32-array; skriver i out eller en gjenbrukt buffer.
+      - radius, size, occupancy (TileOccupancy).
+    """
+
+    def __init__(self, game, radius=8):
+        self.game = game
+        self.radius = radius
+        self.size = 2 * radius + 1
+        self.obs = np.zeros((len(CHANNELS), self.size, self.size), dtype=np.float32)
+        self.occupancy = TileOccupancy(radius)
+        game.world.occupancy = self.occupancy
+        self.occupancy.resync(game.world)
+
+        self._statics = {}       # room -> float32 (3, H, W) terreng + dør-tiles
+        self._room = None
+        self._static = None
+        self._doors_open = None
+
+    def observe(self, out=None):
+        world, player, rm = self.game.world, self.game.player, self.game.room_manager
+        room = world.current_room
+        occ = self.occupancy
+        if occ.room is not room:
+            occ.resync(world)
+        if room is not self._room:
+            self._use_room(room)
+        doors_open = bool(rm._doors_open)
+        if doors_open != self._doors_open:
+            self._set_doors(doors_open)
+
+        T = constants.TILE_SIZE
+        gx = min(max(player.rect.centerx // T, 0), room.cols - 1)
+        gy = min(max(player.rect.centery // T, 0), room.rows - 1)
+        ys, xs = slice(gy, gy + self.size), slice(gx, gx + self.size)
+
+        if out is None:
+            out = self.obs
+        out[:_STATIC] = self._static[:, ys, xs]
+        out[_STATIC:_STATIC + 5] = occ.grid[:, ys, xs]
+
+        now = world.clock.get_ticks()
+        buffs = player.buff_timers
+        for k, name in enumerate(_BUFFS):
+            start = buffs.get(name)
+            left = 0.0 if start is None else 1.0 - (now - start) / constants.BUFF_DURATIONS[name]
+            out[_STATIC + 5 + k] = min(1.0, max(0.0, left))
+        return out
+
+    # ---------- helpers ----------
+    def _use_room(self, room):
+        static = self._statics.get(room)
+        if static is None:
+            r = self.radius
+            static = np.zeros((_STATIC, room.rows + 2 * r, room.cols + 2 * r), dtype=np.float32)
+            static[0] = 1.0
+            tiles = np.frombuffer(room.tiles, dtype=np.uint8).reshape(room.rows, room.cols)
+            static[0, r:r + room.rows, r:r + room.cols] = tiles == constants.TILE_WALL
+            for gx, gy in room.doors:
+                static[1, gy + r, gx + r] = 1.0
+            self._statics[room] = static
+        self._room = room
+        self._static = static
+        self._doors_open = None  # dør-tilene skrives av _set_doors
+
+    def _set_doors(self, open_flag):
+        r = self.radius
+        closed, opened = (0.0, 1.0) if open_flag else (1.0, 0.0)
+        for gx, gy in self._room.doors:
+            self._static[1, gy + r, gx + r] = closed
+            self._static[2, gy + r, gx + r] = opened
+        self._doors_open = open_flag
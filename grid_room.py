@@ -1,12 +1,20 @@
 import pygame
 import constants
-import copy
 
 CHAR_TO_TILE = {
     '.': constants.TILE_FLOOR,
     '#': constants.TILE_WALL,
 }
 
+# spawn-markører (står alltid på gulv)
+CHAR_TO_SPAWN = {
+    'E': 'enemy',
+    'S': 'speed_powerup',
+    'A': 'attack_powerup',
+    'H': 'shield_powerup',
+    'D': 'door',
+}
+
 class GridRoom:
     def __init__(self, lines):
         """
@@ -18,48 +26,44 @@ class GridRoom:
         "#..###......###..E.#",
         "#..................#",
         "####################",
+
+        Rommet kompileres én gang:
+          - tiles:      flat bytearray (rows * cols, radvis) med TILE_FLOOR/TILE_WALL
+          - wall_rects: ferdige pygame.Rect for alle vegg-tiles
+          - doors:      [(gx, gy), ...]
+          - spawn_list: [(gx, gy, tag), ...] i rad-rekkefølge (bare rutene med markør)
+        Ingenting av dette endres når rommet lastes, så det trengs ingen reset.
         """
         self.rows = len(lines)
         self.cols = max(len(row) for row in lines)
 
-        self.terrain = [[constants.TILE_FLOOR for _ in range(self.cols)] for _ in range(self.rows)]
-        self.spawns  = [[None for _ in range(self.cols)] for _ in range(self.rows)]
-
-        self.doors   = []  # liste av dict/tuple
+        self.tiles = bytearray(self.cols * self.rows)  # TILE_FLOOR == 0
+        self.spawn_list = []
+        self.doors   = []  # liste av (gx, gy)
 
         for y, row in enumerate(lines):
             for x, ch in enumerate(row):
-                if ch in ('.', '#'):
-                    self.terrain[y][x] = CHAR_TO_TILE[ch]
-                elif ch == 'E':
-                    self.terrain[y][x] = constants.TILE_FLOOR
-                    self.spawns[y][x] = 'enemy'
-                elif ch == 'S':
-                    self.terrain[y][x] = constants.TILE_FLOOR
-                    self.spawns[y][x] = 'speed_powerup'
-                elif ch == 'A':
-                    self.terrain[y][x] = constants.TILE_FLOOR
-                    self.spawns[y][x] = 'attack_powerup'
-                elif ch == 'H':
-                    self.terrain[y][x] = constants.TILE_FLOOR
-                    self.spawns[y][x] = 'shield_powerup'
-                elif ch == 'D':
-                    self.terrain[y][x] = constants.TILE_FLOOR
-                    self.spawns[y][x] = 'door'
-                    self.doors.append((x,y))
+                if ch in CHAR_TO_TILE:
+                    self.tiles[y * self.cols + x] = CHAR_TO_TILE[ch]
+                elif ch in CHAR_TO_SPAWN:
+                    tag = CHAR_TO_SPAWN[ch]
+                    self.spawn_list.append((x, y, tag))
+                    if tag == 'door':
+                        self.doors.append((x, y))
+
+        self.wall_rects = [
+            self.tile_rect(i % self.cols, i // self.cols)
+            for i, t in enumerate(self.tiles) if t == constants.TILE_WALL
+        ]
+
+    def tile_at(self, gx, gy):
+        return self.tiles[gy * self.cols + gx]
 
-        self._original_spawns = copy.deepcopy(self.spawns)
-    
     def is_blocked(self, gx, gy):
         if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
             return True
-        return self.terrain[gy][gx] == constants.TILE_WALL
+        return self.tiles[gy * self.cols + gx] == constants.TILE_WALL
 
     def tile_rect(self, gx, gy):
         x, y = gx * constants.TILE_SIZE, gy * constants.TILE_SIZE
         return pygame.Rect(x, y, constants.TILE_SIZE, constants.TILE_SIZE)
-    
-    def reset_spawns(self):
-        self.spawns = copy.deepcopy(self._original_spawns)
-
-
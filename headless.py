@@ -0,0 +1,87 @@
+import constants
+from player import Player
+from camera import Camera
+from gamecontroller import InputState, apply_input
+from world import World
+from room_manager import RoomManager
+from sim_clock import SimClock
+import snapshot
+
+class HeadlessGame:
+    """
+    Spillet uten display og event-loop, drevet av en SimClock.
+
+    Samme rekkefølge som løkka i main.py, men input kommer som InputState og
+    tiden går bare når step() kalles. Kan derfor kjøres mye raskere enn 60 fps.
+
+    Public API:
+      - step(inp=None, dt_ms=None): simuler én tick.
+      - reset(seed=None): ny episode fra startrommet (via RoomManager._load_room);
+        med seed seedes alle random-strømmer på nytt.
+      - seed: rot-seeden til World.rng (samme seed + samme input → samme kjøring).
+      - snapshot() / restore(snap): lagre og gjenopprett hele tilstanden (snapshot.py).
+      - kills / rooms_cleared: hva som skjedde i forrige step (for rewards).
+      - world, room_manager, player, camera, clock: selve spilltilstanden.
+    """
+
+    def __init__(self, screen_size=(1280, 720), tick_ms=None, seed=None):
+        self.tick_ms = tick_ms if tick_ms is not None else constants.SIM_TICK_MS
+        self.clock = SimClock()
+        sw, sh = screen_size
+
+        self.player = Player(sw // 2, sh // 2, self.clock)
+        self.camera = Camera(sw, sh)
+        self.world = World(self.clock, seed)
+        self.room_manager = RoomManager(self.world, self.player, self.camera)
+        self.ticks = 0
+        self.kills = 0
+        self.rooms_cleared = 0
+
+    @property
+    def seed(self):
+        return self.world.rng.seed
+
+    def reset(self, seed=None):
+        """Start ny episode i startrommet. Klokka fortsetter (bare relative tider brukes)."""
+        if seed is not None:
+            self.world.reseed(seed)
+        rm = self.room_manager
+        self.player.reset_stats()
+        rm.current_room_type = "start"
+        rm._load_room(rm.rooms["start"][0], entry_side="N")
+        self.camera.update(self.player.rect)
+        self.ticks = 0
+        self.kills = 0
+        self.rooms_cleared = 0
+
+    def snapshot(self):
+        return snapshot.capture(self)
+
+    def restore(self, snap):
+        snapshot.restore(self, snap)
+
+    @property
+    def done(self):
+        return self.player.health <= 0
+
+    def step(self, inp=None, dt_ms=None):
+        """Simuler én tick. Returnerer True hvis spilleren fortsatt lever."""
+        if inp is None:
+            inp = InputState()
+        if dt_ms is None:
+            dt_ms = self.tick_ms
+
+        player, world = self.player, self.world
+        player.update_buffs()
+        apply_input(player, world.collision, world, inp)
+        self.camera.update(player.rect)
+
+        enemies_before = len(world.enemies)
+        world.update(dt_ms, player, self.camera)
+        self.kills = enemies_before - len(world.enemies)
+
+        rooms_before = self.room_manager.rooms_loaded
+        self.room_manager.update()
+        self.rooms_cleared = self.room_manager.rooms_loaded - rooms_before
+        self.ticks += 1
+        return not self.done
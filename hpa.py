@@ -0,0 +1,261 @@
+import itertools
+from collections import deque
+from heapq import heappush, heappop
+
+import constants
+
+# Samme naborekkefølge som resten av pathfindingen (lik tie-break)
+DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+def wants_hpa(room):
+    """True hvis rommet er stort nok til at HPA*-grafen lønner seg (NAV_HPA_MIN_TILES)."""
+    return room.cols * room.rows >= constants.NAV_HPA_MIN_TILES
+
+class HierarchicalNav:
+    """
+    HPA*-navigasjon over et GridRoom (bygges når rommet lastes).
+
+    Rommet deles i klynger på cluster_size × cluster_size tiles. Langs hver
+    klyngegrense finnes åpne strekk; hvert strekk får én overgang (midten)
+    eller to (endene, hvis strekket er langt). Overgangs-tilene er noder i en
+    abstrakt graf med:
+      - inter-kanter (kost 1) over grensen
+      - intra-kanter mellom noder i samme klynge, med ferdig utregnet tile-sti
+    Et søk setter inn start og mål i sine klynger, kjører A* i den lille grafen
+    og skjøter sammen de lagrede stiene – kostnaden følger antall klynger langs
+    ruten, ikke kartets størrelse.
+
+    Dynamiske blockers (lukkede dører) settes med set_blocked(); da bygges bare
+    klyngen tilen ligger i og dens naboer på nytt.
+
+    Public API:
+      - HierarchicalNav(room, cluster_size=..., blocked=(), build=True): blocked er
+        tiles som starter dynamisk blokkert (lukkede dører); build=False lar
+        kalleren bygge grafen selv med build_steps().
+      - build_steps(): generator som bygger grafen og yielder etter hver rad med
+        klyngegrenser og etter hver klynge (~1-2 ms per steg), for stegvis bygging.
+      - find_path(start_g, goal_g): tuple av tiles (start..mål) eller None.
+      - is_blocked(gx, gy): vegg, dynamisk blocker eller utenfor rommet.
+      - set_blocked(gx, gy, blocked): endre én tile inkrementelt.
+      - Tellere: expansions (abstrakte noder ekspandert), rebuilt_clusters.
+
+    Stiene er nesten optimale (standard HPA*), ikke alltid korteste.
+    """
+
+    def __init__(self, room, cluster_size=constants.NAV_CLUSTER_SIZE, blocked=(), build=True):
+        self.room = room
+        self.cols, self.rows = room.cols, room.rows
+        self.cluster_size = cluster_size
+        self.ccols = -(-self.cols // cluster_size)
+        self.crows = -(-self.rows // cluster_size)
+        self.expansions = 0
+        self.rebuilt_clusters = 0
+
+        self._wall = bytearray(t == constants.TILE_WALL for t in room.tiles)
+        self._dyn = bytearray(self.cols * self.rows)   # 1 = dynamisk blokkert
+        self._borders = {}   # (klynge_a, klynge_b) -> [(tile_a, tile_b), ...]
+        self._nodes = {}     # klynge -> set(tile)
+        self._inter = {}     # tile -> set(tile) over grenser
+        self._adj = {}       # tile -> [(nabo, kost, sti (tuple)), ...] intra + inter
+
+        for gx, gy in blocked:
+            if 0 <= gx < self.cols and 0 <= gy < self.rows:
+                self._dyn[gy * self.cols + gx] = 1
+        if build:
+            for _ in self.build_steps():
+                pass
+
+    def build_steps(self):
+        # grenser (billig): én rad med klynger per steg
+        for cy in range(self.crows):
+            for cx in range(self.ccols):
+                if cx + 1 < self.ccols:
+                    self._build_border((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.crows:
+                    self._build_border((cx, cy), (cx, cy + 1))
+            yield
+        # intra-stier (BFS per node, det dyre): én klynge per steg
+        for cy in range(self.crows):
+            for cx in range(self.ccols):
+                self._build_cluster((cx, cy))
+                yield
+
+    # ---------- spørring ----------
+    def is_blocked(self, gx, gy):
+        if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
+            return True
+        i = gy * self.cols + gx
+        return bool(self._wall[i] or self._dyn[i])
+
+    def find_path(self, start_g, goal_g):
+        if self.is_blocked(*start_g) or self.is_blocked(*goal_g):
+            return None
+        if start_g == goal_g:
+            return (start_g,)
+
+        cs, cg = self._cluster_of(start_g), self._cluster_of(goal_g)
+        if cs == cg:
+            local = self._bfs(cs, start_g, (goal_g,)).get(goal_g)
+            if local is not None:
+                return local
+
+        # midlertidige kanter fra start / til mål innen egen klynge
+        start_links = self._bfs(cs, start_g, self._nodes[cs])
+        goal_links = {n: p[::-1] for n, p in self._bfs(cg, goal_g, self._nodes[cg]).items()}
+        if not start_links or not goal_links:
+            return None
+
+        gx, gy = goal_g
+        counter = itertools.count()
+        openh = [(0, 0, next(counter), start_g)]
+        g = {start_g: 0}
+        came = {start_g: None}   # node -> (forrige node, sti-segment)
+        closed = set()
+        expansions = 0
+
+        while openh:
+            _, _, _, cur = heappop(openh)
+            if cur in closed:
+                continue
+            closed.add(cur)
+            expansions += 1
+            if cur == goal_g:
+                break
+
+            if cur == start_g:
+                links = [(n, len(p) - 1, p) for n, p in start_links.items()]
+                links += [(n, 1, (cur, n)) for n in self._inter.get(cur, ())]
+            else:
+                links = self._adj.get(cur, ())
+                if cur in goal_links:
+                    seg = goal_links[cur]
+                    links = list(links) + [(goal_g, len(seg) - 1, seg)]
+
+            gc = g[cur]
+            for nxt, cost, seg in links:
+                ng = gc + cost
+                if ng < g.get(nxt, ng + 1):
+                    g[nxt] = ng
+                    came[nxt] = (cur, seg)
+                    # lik f: foretrekk noden som er kommet lengst (færre ekspansjoner)
+                    heappush(openh, (ng + abs(nxt[0] - gx) + abs(nxt[1] - gy), -ng, next(counter), nxt))
+
+        self.expansions += expansions
+        if goal_g not in came:
+            return None
+
+        segments = []
+        node = goal_g
+        while came[node] is not None:
+            prev, seg = came[node]
+            segments.append(seg)
+            node = prev
+        path = [start_g]
+        for seg in reversed(segments):
+            path.extend(seg[1:])
+        return tuple(path)
+
+    # ---------- oppdatering ----------
+    def set_blocked(self, gx, gy, blocked):
+        if gx < 0 or gy < 0 or gx >= self.cols or gy >= self.rows:
+            return
+        i = gy * self.cols + gx
+        if self._dyn[i] == bool(blocked):
+            return
+        self._dyn[i] = bool(blocked)
+
+        c = self._cluster_of((gx, gy))
+        cx, cy = c
+        neighbours = [(cx + dx, cy + dy) for dx, dy in DIRS
+                      if 0 <= cx + dx < self.ccols and 0 <= cy + dy < self.crows]
+        for n in neighbours:
+            self._build_border(min(c, n), max(c, n))
+        for cl in [c] + neighbours:
+            self._build_cluster(cl)
+
+    # ---------- helpers ----------
+    def _cluster_of(self, tile):
+        return (tile[0] // self.cluster_size, tile[1] // self.cluster_size)
+
+    def _bounds(self, cluster):
+        cs = self.cluster_size
+        x0, y0 = cluster[0] * cs, cluster[1] * cs
+        return x0, y0, min(x0 + cs, self.cols), min(y0 + cs, self.rows)
+
+    def _build_border(self, a, b):
+        """Finn overganger mellom nabo-klyngene a og b (a er venstre/øverst)."""
+        for ta, tb in self._borders.get((a, b), ()):
+            self._inter[ta].discard(tb)
+            self._inter[tb].discard(ta)
+
+        ax0, ay0, ax1, ay1 = self._bounds(a)
+        if a[1] == b[1]:   # loddrett grense: a til venstre for b
+            pairs = [((ax1 - 1, y), (ax1, y)) for y in range(ay0, ay1)]
+        else:              # vannrett grense: a over b
+            pairs = [((x, ay1 - 1), (x, ay1)) for x in range(ax0, ax1)]
+
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and not self.is_blocked(*pair[0]) and not self.is_blocked(*pair[1]):
+                run.append(pair)
+                continue
+            if run:
+                if len(run) < 6:
+                    transitions.append(run[len(run) // 2])
+                else:
+                    transitions.extend((run[0], run[-1]))
+                run = []
+
+        self._borders[(a, b)] = transitions
+        for ta, tb in transitions:
+            self._inter.setdefault(ta, set()).add(tb)
+            self._inter.setdefault(tb, set()).add(ta)
+
+    def _build_cluster(self, cluster):
+        """Samle klyngens noder fra grensene og regn ut intra-stier mellom dem."""
+        for n in self._nodes.get(cluster, ()):
+            self._adj.pop(n, None)
+
+        cx, cy = cluster
+        nodes = set()
+        for other, mine in (((cx - 1, cy), 1), ((cx + 1, cy), 0), ((cx, cy - 1), 1), ((cx, cy + 1), 0)):
+            key = (cluster, other) if mine == 0 else (other, cluster)
+            for pair in self._borders.get(key, ()):
+                nodes.add(pair[mine])
+        self._nodes[cluster] = nodes
+
+        for n in nodes:
+            paths = self._bfs(cluster, n, nodes)
+            paths.pop(n, None)
+            adj = [(m, len(p) - 1, p) for m, p in paths.items()]
+            adj += [(m, 1, (n, m)) for m in self._inter.get(n, ())]
+            self._adj[n] = adj
+        self.rebuilt_clusters += 1
+
+    def _bfs(self, cluster, src, targets):
+        """BFS innen klyngen fra src; {mål: sti (src..mål)} for målene som nås."""
+        x0, y0, x1, y1 = self._bounds(cluster)
+        wanted = set(targets)
+        found = {}
+        came = {src: None}
+        q = deque([src])
+        while q and len(found) < len(wanted):
+            cur = q.popleft()
+            if cur in wanted:
+                path = []
+                node = cur
+                while node is not None:
+                    path.append(node)
+                    node = came[node]
+                found[cur] = tuple(reversed(path))
+            x, y = cur
+            for dx, dy in DIRS:
+                nx, ny = x + dx, y + dy
+                if nx < x0 or ny < y0 or nx >= x1 or ny >= y1:
+                    continue
+                if (nx, ny) in came or self.is_blocked(nx, ny):
+                    continue
+                came[(nx, ny)] = cur
+                q.append((nx, ny))
+        return found
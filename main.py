@@ -2,9 +2,13 @@ import pygame
 import constants
 from player import Player
 from camera import Camera
-from gamecontroller import player_input
+from gamecontroller import read_input, apply_input
 from world import World
 from room_manager import RoomManager
+from sim_clock import SimClock
+from timestep import FixedTimestep
+from profiler import PROFILER
+from replay import Recording
 
 pygame.init()
 clock = pygame.time.Clock()
@@ -12,39 +16,92 @@ clock = pygame.time.Clock()
 screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
 screen_width, screen_height = screen.get_size()
 
-player = Player(screen_width // 2, screen_height // 2)
+# All spill-logikk går på simuleringstid, som bare flyttes av faste ticks
+sim_clock = SimClock()
+player = Player(screen_width // 2, screen_height // 2, sim_clock)
 camera = Camera(screen_width, screen_height)
 
-world = World()
+world = World(sim_clock)  # seed trekkes tilfeldig; lagres i opptaket
 room_manager = RoomManager(world, player, camera)
 
+# Opptak: seed + input per tick → kan spilles av headless med replay.py
+recording = None
+if constants.REPLAY_RECORD:
+    recording = Recording(world.rng.seed, constants.SIM_TICK_MS, (screen_width, screen_height))
+
+timestep = FixedTimestep(constants.SIM_TICK_MS, constants.SIM_MAX_TICKS_PER_FRAME)
+if constants.PROFILE_ENABLED:
+    PROFILER.enable()
+
+def simulate_tick(inp):
+    with PROFILER.scope("sim.input"):
+        player.update_buffs()
+        apply_input(player, world.collision, world, inp)
+        camera.update(player.rect)
+
+    with PROFILER.scope("sim.world"):
+        world.update(timestep.tick_ms, player, camera)
+
+    # etter verden – dørlogikk og rombytte
+    with PROFILER.scope("sim.rooms"):
+        room_manager.update()
+
+def lerp(a, b, t):
+    return a + (b - a) * t
+
+prev_topleft = player.rect.topleft
+
 run = True
 while run:
+    frame_ms = clock.tick(constants.RENDER_FPS_CAP)
+
     for event in pygame.event.get():
         if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
             run = False
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            if PROFILER.enabled:
+                PROFILER.disable()
+            else:
+                PROFILER.enable()
 
-    # update
-    player.update_buffs()
-    player_input(player, world.obstacles, world, camera)
-    camera.update(player.rect)
-
-    dt_ms = clock.get_time()
-    world.update(dt_ms, player, camera)
-    
-    if player.health <= 0:
-        run = False
+    # update: 0..SIM_MAX_TICKS_PER_FRAME faste ticks, samme input for alle
+    inp = read_input(camera)
+    for _ in range(timestep.advance(frame_ms)):
+        prev_topleft = player.rect.topleft
+        rooms_before = room_manager.rooms_loaded
+        simulate_tick(inp)
+        if recording is not None:
+            recording.record(inp, world, player, room_manager)
+        if room_manager.rooms_loaded != rooms_before:
+            prev_topleft = player.rect.topleft  # ikke interpoler gjennom rombytte
+        if player.health <= 0:
+            run = False
+            break
 
-    # etter verden – dørlogikk og rombytte
-    room_manager.update()
+    # draw: interpoler spiller, kamera, fiender, kuler og partikler mellom forrige og nåværende tick
+    alpha = timestep.alpha
+    x0, y0 = prev_topleft
+    x1, y1 = player.rect.topleft
+    draw_topleft = (round(lerp(x0, x1, alpha)), round(lerp(y0, y1, alpha)))
+    camera.offset.x = draw_topleft[0] + player.rect.width // 2 - camera.sw // 2
+    camera.offset.y = draw_topleft[1] + player.rect.height // 2 - camera.sh // 2
 
-    # draw
     screen.fill(constants.BLACK)
-    world.draw(screen, camera)
-    room_manager.draw(screen)  
-    player.draw(screen, camera)
+    world.draw(screen, camera, alpha)
+    with PROFILER.scope("draw.doors"):
+        room_manager.draw(screen)
+    with PROFILER.scope("draw.player"):
+        player.draw(screen, camera, draw_topleft)
+    if PROFILER.enabled:
+        PROFILER.draw_overlay(screen)
+
+    with PROFILER.scope("draw.flip"):
+        pygame.display.flip()
+    PROFILER.end_frame()
 
-    pygame.display.flip()
-    clock.tick(60)
+if PROFILER.enabled:
+    PROFILER.dump_jsonl(constants.PROFILE_DUMP_PATH)
+if recording is not None:
+    recording.save(constants.REPLAY_PATH)
 
 pygame.quit()
@@ -1,18 +1,121 @@
 import pygame
 import random
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.pos = pygame.Vector2(x, y)
-        self.vel = pygame.Vector2(random.uniform(-2, 2), random.uniform(-2, 2))
-        self.timer = 500  # ms: lever i 0.5 sekunder
-        self.color = color
-        self.size = random.randint(2, 5)
-    
+import numpy as np
+
+PARTICLE_LIFETIME_MS = 500  # lever i 0.5 sekunder
+
+class ParticleSystem:
+    """
+    Alle partikler i sammenhengende arrays (posisjon, fart, timer, farge, størrelse).
+
+    update() flytter og teller ned alle på én gang og fjerner utløpte med en
+    maske (kompaktering), draw() culler mot kameraet og tegner alt med én blits.
+    Som før beveger partiklene seg vel px per frame (uavhengig av dt).
+    prev holder posisjonene fra før siste update(), så draw() kan interpolere.
+
+    Public API:
+      - spawn(x, y, n, color): lag n gnister i (x, y).
+      - update(dt_ms), draw(screen, camera, alpha=1.0), clear(), len(system).
+      - reseed(rng=None): ny numpy-generator seedet fra rng (replay/seedede episoder).
+    """
+
+    def __init__(self, capacity=256, rng=None):
+        self.count = 0
+        self._allocate(capacity)
+        self.reseed(rng)
+        self._sprites = {}  # (r, g, b, size) -> ferdig fylt Surface
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def reseed(self, rng=None):
+        """Seed numpy-generatoren fra rng (random.Random), ellers fra random-modulen."""
+        self.rng = np.random.default_rng((rng if rng is not None else random).getrandbits(32))
+
+    def spawn(self, x, y, n, color):
+        if n <= 0:
+            return
+        self._reserve(self.count + n)
+        i, j = self.count, self.count + n
+        self.pos[i:j] = (x, y)
+        self.prev[i:j] = (x, y)
+        self.vel[i:j] = self.rng.uniform(-2, 2, (n, 2))
+        self.timer[i:j] = PARTICLE_LIFETIME_MS
+        self.color[i:j] = color[:3]
+        self.size[i:j] = self.rng.integers(2, 6, n)  # 2..5 px
+        self.count = j
+
     def update(self, dt):
-        self.pos += self.vel
-        self.timer -= dt
+        n = self.count
+        if not n:
+            return
+        self.prev[:n] = self.pos[:n]
+        self.pos[:n] += self.vel[:n]
+        self.timer[:n] -= dt
+
+        alive = self.timer[:n] > 0
+        k = int(np.count_nonzero(alive))
+        if k != n:
+            for arr in (self.pos, self.prev, self.vel, self.timer, self.color, self.size):
+                arr[:k] = arr[:n][alive]
+            self.count = k
+
+    def draw(self, screen, camera, alpha=1.0):
+        n = self.count
+        if not n:
+            return
+        pos = self.pos[:n]
+        if alpha < 1.0:
+            pos = self.prev[:n] + (pos - self.prev[:n]) * alpha
+        # world -> screen (trunkeres som pygame.Rect gjorde)
+        xy = pos.astype(np.int64) - (int(camera.offset.x), int(camera.offset.y))
+        size = self.size[:n]
+        sw, sh = screen.get_size()
+        visible = (xy[:, 0] < sw) & (xy[:, 1] < sh) & (xy[:, 0] + size > 0) & (xy[:, 1] + size > 0)
+        idx = np.flatnonzero(visible)
+        if not idx.size:
+            return
+
+        sprite = self._sprite
+        colors = self.color[idx].tolist()
+        sizes = size[idx].tolist()
+        points = xy[idx].tolist()
+        screen.blits(
+            [(sprite(c, s), p) for c, s, p in zip(colors, sizes, points)],
+            doreturn=False
+        )
+
+    # ---------- helpers ----------
+    def _sprite(self, color, size):
+        key = (color[0], color[1], color[2], size)
+        surf = self._sprites.get(key)
+        if surf is None:
+            surf = pygame.Surface((size, size))
+            surf.fill(color)
+            self._sprites[key] = surf
+        return surf
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev = np.zeros((capacity, 2), dtype=np.float64)
+        self.vel = np.zeros((capacity, 2), dtype=np.float64)
+        self.timer = np.zeros(capacity, dtype=np.float64)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.size = np.zeros(capacity, dtype=np.int32)
 
-    def draw(self, screen, camera):
-        draw_pos = camera.apply(pygame.Rect(self.pos.x, self.pos.y, self.size, self.size))
-        pygame.draw.rect(screen, self.color, draw_pos)
+    def _reserve(self, needed):
+        if needed <= self.capacity:
+            return
+        cap = self.capacity
+        while cap < needed:
+            cap *= 2
+        old = (self.pos, self.prev, self.vel, self.timer, self.color, self.size)
+        n = self.count
+        self._allocate(cap)
+        for dst, src in zip((self.pos, self.prev, self.vel, self.timer, self.color, self.size), old):
+            dst[:n] = src[:n]
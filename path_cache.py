@@ -0,0 +1,128 @@
+import itertools
+from collections import OrderedDict
+from heapq import heappush, heappop
+
+# Samme naborekkefølge som Enemy._astar_next_step (lik tie-break)
+DIRS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+_NO_PATH = ()  # cachet "ingen rute"
+
+class PathCache:
+    """
+    Delte, hele grid-stier (A*, 4-retninger) nøklet på (start, mål, versjon).
+
+    En sti er en tuple av tiles fra start til og med mål. Fiender lagrer stien
+    og følger den tile for tile (Enemy._path_next_step), så de fleste ticks gjør
+    ingen søk og ikke engang et cache-oppslag. Ny sti hentes bare når fienden
+    er dyttet av stien, målet er byttet eller versjonen er endret.
+
+    Public API:
+      - path(room, start_g, goal_g, max_len=None): tuple (start..mål) eller None.
+        max_len begrenser antall steg (som dybdegrensen i _micro_wander).
+      - invalidate(): øk version (dør åpnet/lukket); eldre stier regnes som ugyldige.
+      - clear(): tøm alt (rombytte).
+      - Tellere: hits, misses, expansions (noder ekspandert i alle søk).
+
+    Med nav (HierarchicalNav, bare i store rom) brukes HPA* for lange søk uten
+    max_len. Blokkerte tiles hentes fra nav, ellers fra collision
+    (CollisionGrid), så lukkede dører alltid regnes som vegg.
+
+    Byttes rommet, tømmes cachen automatisk.
+    """
+
+    def __init__(self, max_paths=512, max_expansions=4096, nav=None, collision=None):
+        self.nav = nav
+        self.collision = collision
+        self.max_paths = max_paths
+        self.max_expansions = max_expansions
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.expansions = 0
+        self._room = None
+        self._paths = OrderedDict()  # (start, goal, version, max_len) -> tuple (LRU)
+
+    def clear(self):
+        self._room = None
+        self._paths.clear()
+        self.version += 1
+
+    def invalidate(self):
+        self.version += 1
+        self._paths.clear()
+
+    def path(self, room, start_g, goal_g, max_len=None):
+        if room is not self._room:
+            self.clear()
+            self._room = room
+
+        key = (start_g, goal_g, self.version, max_len)
+        p = self._paths.get(key)
+        if p is not None:
+            self.hits += 1
+            self._paths.move_to_end(key)
+        else:
+            self.misses += 1
+            p = self._search(room, start_g, goal_g, max_len) or _NO_PATH
+            self._paths[key] = p
+            if len(self._paths) > self.max_paths:
+                self._paths.popitem(last=False)
+        return p or None
+
+    # ---------- helpers ----------
+    def _search(self, room, start, goal, max_len):
+        nav = self.nav if self.nav is not None and self.nav.room is room else None
+        if nav is not None:
+            is_blocked = nav.is_blocked
+        elif self.collision is not None:
+            is_blocked = self.collision.is_blocked
+        else:
+            is_blocked = room.is_blocked
+        if start == goal:
+            return (start,)
+        if is_blocked(*goal) or is_blocked(*start):
+            return None
+        # lange søk uten lengdegrense: hierarkisk (kostnad ~ antall klynger langs ruten)
+        if nav is not None and max_len is None and \
+                abs(start[0] - goal[0]) + abs(start[1] - goal[1]) > nav.cluster_size:
+            return nav.find_path(start, goal)
+
+        gx, gy = goal
+        openh = []
+        counter = itertools.count()
+        g = {start: 0}
+        came = {start: None}
+        heappush(openh, (abs(start[0] - gx) + abs(start[1] - gy), next(counter), start))
+        closed = set()
+        expansions = 0
+
+        try:
+            while openh and expansions < self.max_expansions:
+                _, _, cur = heappop(openh)
+                if cur in closed:
+                    continue
+                closed.add(cur)
+                expansions += 1
+
+                if cur == goal:
+                    path = []
+                    while cur is not None:
+                        path.append(cur)
+                        cur = came[cur]
+                    return tuple(reversed(path))
+
+                ng = g[cur] + 1
+                if max_len is not None and ng > max_len:
+                    continue
+                cx, cy = cur
+                for dx, dy in DIRS:
+                    nxt = (cx + dx, cy + dy)
+                    if ng >= g.get(nxt, ng + 1) or is_blocked(*nxt):
+                        continue
+                    g[nxt] = ng
+                    came[nxt] = cur
+                    h = abs(nxt[0] - gx) + abs(nxt[1] - gy)
+                    heappush(openh, (ng + h + 1e-6 * h, next(counter), nxt))
+            return None
+        finally:
+            self.expansions += expansions
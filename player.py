@@ -1,8 +1,10 @@
 import pygame
 import constants
+from sim_clock import WallClock
 
 class Player:
-    def __init__(self, x, y,):
+    def __init__(self, x, y, clock=None):
+        self.clock = clock if clock is not None else WallClock()
         self.rect = pygame.Rect(x, y, *constants.PLAYER_SIZE)
         self.color = constants.PLAYER_COLOR
         self.speed = constants.PLAYER_SPEED
@@ -19,11 +21,20 @@ class Player:
         # Buffs
         self.buff_timers = {}
     
-    def check_collision_obstacle(self, obstacles):
-        for obstacle in obstacles:
-            if self.rect.colliderect(obstacle):
-                return True
-        return False
+    def reset_stats(self):
+        """Tilbake til start-verdier (helse, fart, buffs) – brukes ved ny episode."""
+        self.speed = constants.PLAYER_SPEED
+        self.health = constants.PLAYER_HEALTH
+        self.dps = constants.PLAYER_DPS
+        self.alive = constants.ALIVE
+        self.attack_cooldown = constants.PLAYER_ATTACK_COOLDOWN
+        self.playerAttack = False
+        self.debug_attack_rect = None
+        self.debug_attack_until = 0
+        self.buff_timers.clear()
+
+    def check_collision_obstacle(self, collision):
+        return collision.collides(self.rect)
     
     def check_collision_enemy(self, enemies):
         for enemy in enemies:
@@ -32,7 +43,7 @@ class Player:
         return False
     
     def apply_buff(self, powerup):
-        now = pygame.time.get_ticks()
+        now = self.clock.get_ticks()
         if powerup == 'speed_boost':
             self.speed += 3
             self.buff_timers[powerup] = now
@@ -44,7 +55,7 @@ class Player:
             self.buff_timers[powerup] = now
             
     def update_buffs(self):
-        now = pygame.time.get_ticks()
+        now = self.clock.get_ticks()
         expired = []
         for name, start in list(self.buff_timers.items()):
             duration = constants.BUFF_DURATIONS.get(name, 0)
@@ -66,7 +77,9 @@ class Player:
         T = constants.TILE_SIZE
         return (int(self.rect.centerx) // T, int(self.rect.centery) // T)
 
-    def draw(self, screen, camera):
-        draw_rect = camera.apply(self.rect)
+    def draw(self, screen, camera, topleft=None):
+        # topleft: valgfri (interpolert) world-posisjon å tegne på i stedet for rect
+        rect = self.rect if topleft is None else self.rect.move(topleft[0] - self.rect.x, topleft[1] - self.rect.y)
+        draw_rect = camera.apply(rect)
         color = constants.RED if self.playerAttack else self.color
         pygame.draw.rect(screen, color, draw_rect)
\ No newline at end of file
@@ -0,0 +1,203 @@
+import importlib
+import json
+import time
+from functools import wraps
+
+import numpy as np
+import pygame
+
+import constants
+
+perf_counter = time.perf_counter
+
+class _NullScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class _Scope:
+    __slots__ = ("prof", "name", "t0")
+
+    def __init__(self, prof, name):
+        self.prof = prof
+        self.name = name
+
+    def __enter__(self):
+        self.prof._enter(self.name)
+        self.t0 = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.prof._leave(self.name, perf_counter() - self.t0)
+        return False
+
+
+# Per-fiende-metoder som måles ved å pakkes inn når profileren slås på.
+# Avslått er de helt urørte (null kostnad).
+# Hver fase måles bare i det ytterste kallet (dybdeteller per fase), så et
+# kall til samme fase inne i en annen telles ikke to ganger. Nøstede kall som
+# skal vises for seg (HPA* inne i PathCache.path) får underfase "<fase>.<navn>",
+# som er inkludert i fasen over.
+# Bevegelse måles ikke her: World.update pakker enemy_motion.move_enemies inn
+# i scope("enemy.movement").
+# (modul, klasse, metode, fase)
+INSTRUMENTED = [
+    ("enemy", "Enemy", "_has_los", "enemy.perception"),
+    ("visibility", "PlayerVisibility", "can_see", "enemy.perception"),
+    ("enemy", "Enemy", "_astar_next_step", "enemy.pathfinding"),
+    ("enemy", "Enemy", "_micro_wander", "enemy.pathfinding"),
+    ("flow_field", "FlowFieldCache", "next_step", "enemy.pathfinding"),
+    ("path_cache", "PathCache", "path", "enemy.pathfinding"),
+    ("hpa", "HierarchicalNav", "find_path", "enemy.pathfinding.hpa"),
+    ("enemy", "Enemy", "_apply_separation", "enemy.separation"),
+]
+
+
+class FrameProfiler:
+    """
+    Tidsmåling per delsystem, samlet per frame i en ringbuffer.
+
+    Public API:
+      - enable() / disable(): slå på/av (pakker inn INSTRUMENTED-metodene).
+      - scope(name): context manager rundt en fase (no-op når avslått).
+      - end_frame(): lagre denne framens tider (ms) i ringbufferen.
+      - summary(): {fase: {"p50", "p95", "p99", "mean"}} i ms.
+      - draw_overlay(screen): tekst-overlay med p50/p95/p99.
+      - dump_jsonl(path, label=None): én linje per frame + en oppsummeringslinje.
+
+    Flere kall til samme fase i en frame (f.eks. én per fiende) summeres;
+    et kall nøstet inne i en måling av samme fase telles ikke på nytt.
+    """
+
+    def __init__(self, capacity=constants.PROFILE_FRAMES):
+        self.enabled = False
+        self.capacity = capacity
+        self.frames = 0              # antall frames lagret totalt
+        self._frame = {}             # fase -> sekunder så langt denne framen
+        self._depth = {}             # fase -> antall åpne målinger (bare ytterste teller)
+        self._history = {}           # fase -> np.array(capacity) i ms
+        self._patched = []           # (klasse, metode, original)
+        self._font = None
+
+    # ---------- av/på ----------
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self._instrument()
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for cls, name, original in self._patched:
+            setattr(cls, name, original)
+        self._patched.clear()
+        self._frame.clear()
+
+    def reset(self):
+        self.frames = 0
+        self._frame.clear()
+        self._history.clear()
+
+    # ---------- måling ----------
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def add(self, name, seconds):
+        self._frame[name] = self._frame.get(name, 0.0) + seconds
+
+    def _enter(self, name):
+        self._depth[name] = self._depth.get(name, 0) + 1
+
+    def _leave(self, name, seconds):
+        d = self._depth[name] - 1
+        self._depth[name] = d
+        if not d:
+            self.add(name, seconds)
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        i = self.frames % self.capacity
+        for name in self._frame.keys() - self._history.keys():
+            self._history[name] = np.zeros(self.capacity)
+        for name, hist in self._history.items():
+            hist[i] = self._frame.get(name, 0.0) * 1000.0
+        self._frame.clear()
+        self.frames += 1
+
+    # ---------- rapport ----------
+    def summary(self):
+        n = min(self.frames, self.capacity)
+        out = {}
+        if not n:
+            return out
+        for name in sorted(self._history):
+            samples = self._history[name][:n]
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            out[name] = {
+                "p50": round(float(p50), 4),
+                "p95": round(float(p95), 4),
+                "p99": round(float(p99), 4),
+                "mean": round(float(samples.mean()), 4),
+            }
+        return out
+
+    def dump_jsonl(self, path, label=None):
+        """Skriv frames i ringbufferen (eldst først) + oppsummering som JSON-linjer."""
+        n = min(self.frames, self.capacity)
+        start = self.frames - n
+        names = sorted(self._history)
+        with open(path, "a", encoding="utf-8") as f:
+            for k in range(n):
+                frame = start + k
+                i = frame % self.capacity
+                ms = {name: round(float(self._history[name][i]), 4) for name in names}
+                f.write(json.dumps({"type": "frame", "label": label, "frame": frame, "ms": ms}) + "\n")
+            f.write(json.dumps({"type": "summary", "label": label, "frames": n, "ms": self.summary()}) + "\n")
+
+    def draw_overlay(self, screen, pos=(10, 10)):
+        if self._font is None:
+            pygame.font.init()
+            self._font = pygame.font.Font(None, 18)
+        lines = ["%-22s %7s %7s %7s" % ("phase (ms)", "p50", "p95", "p99")]
+        for name, s in self.summary().items():
+            lines.append("%-22s %7.2f %7.2f %7.2f" % (name, s["p50"], s["p95"], s["p99"]))
+
+        x, y = pos
+        for line in lines:
+            surf = self._font.render(line, True, (255, 255, 255), (0, 0, 0))
+            screen.blit(surf, (x, y))
+            y += surf.get_height()
+
+    # ---------- helpers ----------
+    def _instrument(self):
+        for module_name, cls_name, meth_name, phase in INSTRUMENTED:
+            cls = getattr(importlib.import_module(module_name), cls_name)
+            original = cls.__dict__[meth_name]
+            setattr(cls, meth_name, self._timed(original, phase))
+            self._patched.append((cls, meth_name, original))
+
+    def _timed(self, fn, phase):
+        prof = self
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            prof._enter(phase)
+            t0 = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof._leave(phase, perf_counter() - t0)
+        return wrapper
+
+
+# Én profiler per prosess; alle moduler bruker denne
+PROFILER = FrameProfiler()
@@ -1,35 +1,188 @@
+import math
+
 import pygame
-from pygame.math import Vector2
+import numpy as np
+
 import constants
 
-class Projectile:
-    def __init__(self, pos, direction):
-            self.pos = Vector2(pos)
-            self.direction = direction.normalize()
-            self.speed = constants.PROJECTILE_SPEED
-            self.damage = constants.PROJECTILE_DAMAGE
-            self.radius = 4
-            self.alive = True
+PROJECTILE_RADIUS = 4
+PROJECTILE_COLOR = (220, 220, 50)
+
+def _round_half_away(a):
+    """Samme avrunding som pygame.Rect bruker for float-koordinater."""
+    return np.where(a >= 0, np.floor(a + 0.5), np.ceil(a - 0.5)).astype(np.int64)
+
+
+class ProjectileSystem:
+    """
+    Alle levende prosjektiler i gjenbrukte arrays (pool).
+
+    Hver frame sveipes hvert prosjektil langs sin bane i delsteg på maks én
+    prosjektilbredde, så raske kuler ikke kan tunnelere gjennom vegger eller
+    fiender ved lange frames. Vegg-testen mot tile-gridet gjøres vektorisert
+    for alle kuler samtidig; fiender hentes fra broadphase (SpatialHash) med
+    sveipets bounding-rect.
+
+    Public API:
+      - spawn(pos, direction): skyt fra pos (px) i retning direction (normaliseres).
+      - update(dt_ms, collision, enemy_hash) -> [(enemy, damage), ...] treff denne framen.
+      - draw(screen, camera, alpha=1.0), clear(), len(system).
+
+    prev holder posisjonene fra før siste update(), så draw() kan tegne
+    interpolert mellom forrige og nåværende tick (alpha fra FixedTimestep).
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.radius = PROJECTILE_RADIUS
+        self._allocate(capacity)
+
+        # én ferdig tegnet kule, blittes for alle
+        r = self.radius
+        self._sprite = pygame.Surface((2 * r + 2, 2 * r + 2))
+        self._sprite.fill(constants.BLACK)
+        self._sprite.set_colorkey(constants.BLACK)
+        pygame.draw.circle(self._sprite, PROJECTILE_COLOR, (r + 1, r + 1), r)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
 
-            self.rect = pygame.Rect(0, 0, self.radius * 2, self.radius * 2)
-            self.rect.center = self.pos
+    def spawn(self, pos, direction, speed=constants.PROJECTILE_SPEED, damage=constants.PROJECTILE_DAMAGE):
+        dx, dy = direction[0], direction[1]
+        length = math.hypot(dx, dy)
+        if length == 0:
+            return
+        self._reserve(self.count + 1)
+        i = self.count
+        self.pos[i] = pos
+        self.prev[i] = pos
+        self.dir[i] = (dx / length, dy / length)
+        self.speed[i] = speed
+        self.damage[i] = damage
+        self.count = i + 1
 
-    def update(self, dt_ms, obstacles):
+    def update(self, dt_ms, collision, enemy_hash):
+        n = self.count
+        if not n:
+            return []
+
+        r = self.radius
+        side = 2 * r
+        T = collision.tile_size
         dt = dt_ms / 1000.0
-        self.pos += self.direction * self.speed * dt
-        self.rect.center = self.pos
-
-        # kollisjon med vegg → dø
-        for obs in obstacles:
-            if self.rect.colliderect(obs):
-                self.alive = False
-                break
-
-    def draw(self, screen, camera):
-        r = camera.apply(self.rect)
-        pygame.draw.circle(
-            screen,
-            (220, 220, 50),
-            r.center,
-            self.radius
-        )
\ No newline at end of file
+
+        p0 = self.prev[:n]
+        p0[:] = self.pos[:n]
+        delta = self.dir[:n] * (self.speed[:n] * dt)[:, None]
+        p1 = p0 + delta
+
+        # delsteg: maks én prosjektilbredde per steg → sammenhengende sveip
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+        steps = np.maximum(1, np.ceil(dist / side)).astype(np.int64)
+        K = int(steps.max())
+        k = np.arange(1, K + 1)
+        t = np.minimum(k[None, :], steps[:, None]) / steps[:, None]            # (n, K)
+        cx = _round_half_away(p0[:, 0, None] + delta[:, 0, None] * t)
+        cy = _round_half_away(p0[:, 1, None] + delta[:, 1, None] * t)
+        left, top = cx - r, cy - r                                              # rect-hjørne per delsteg
+
+        # --- vegger: første delsteg der boksen dekker en solid tile ---
+        wall_hit = self._sweep_walls(collision, left, top, side, T)            # (n, K) bool
+        first_wall = np.where(wall_hit.any(axis=1), wall_hit.argmax(axis=1), K)
+
+        # --- fiender: broadphase med sveipets bounding-rect, så første delsteg ---
+        hits = []
+        alive = np.ones(n, dtype=bool)
+        box = pygame.Rect(0, 0, side, side)
+        for i in range(n):
+            last = min(int(first_wall[i]), K - 1)
+            x0, x1 = int(left[i, 0]), int(left[i, last])
+            y0, y1 = int(top[i, 0]), int(top[i, last])
+            sweep = pygame.Rect(min(x0, x1), min(y0, y1), abs(x1 - x0) + side, abs(y1 - y0) + side)
+            candidates = enemy_hash.query_rect(sweep)
+            if candidates:
+                rects = [e.rect for e in candidates]
+                for s in range(last + 1):
+                    box.x, box.y = int(left[i, s]), int(top[i, s])
+                    j = box.collidelist(rects)
+                    if j != -1:
+                        hits.append((candidates[j], int(self.damage[i])))
+                        alive[i] = False
+                        first_wall[i] = min(first_wall[i], s)
+                        break
+            if first_wall[i] < K:
+                alive[i] = False
+
+        # Stopp der kula traff (for draw/debug), ellers full flytt
+        stop = np.minimum(first_wall, steps - 1)
+        rows = np.arange(n)
+        tt = t[rows, stop]
+        self.pos[:n] = np.where(alive[:, None], p1, p0 + delta * tt[:, None])
+
+        # Kompakter bort døde kuler
+        k_alive = int(np.count_nonzero(alive))
+        if k_alive != n:
+            for arr in (self.pos, self.prev, self.dir, self.speed, self.damage):
+                arr[:k_alive] = arr[:n][alive]
+            self.count = k_alive
+        return hits
+
+    def draw(self, screen, camera, alpha=1.0):
+        n = self.count
+        if not n:
+            return
+        r = self.radius
+        pos = self.pos[:n]
+        if alpha < 1.0:
+            pos = self.prev[:n] + (pos - self.prev[:n]) * alpha
+        c = _round_half_away(pos) - (int(camera.offset.x), int(camera.offset.y))
+        sw, sh = screen.get_size()
+        visible = (c[:, 0] + r >= 0) & (c[:, 1] + r >= 0) & (c[:, 0] - r < sw) & (c[:, 1] - r < sh)
+        pts = (c[visible] - (r + 1)).tolist()
+        if pts:
+            sprite = self._sprite
+            screen.blits([(sprite, p) for p in pts], doreturn=False)
+
+    # ---------- helpers ----------
+    def _sweep_walls(self, collision, left, top, side, T):
+        """(n, K) bool: delsteg der kule-boksen overlapper noe solid."""
+        cols, rows = collision.cols, collision.rows
+        hit = np.zeros(left.shape, dtype=bool)
+        if cols and rows:
+            solid = np.frombuffer(collision.solid, dtype=np.uint8).reshape(rows, cols)
+            for gx in (left // T, (left + side - 1) // T):
+                for gy in (top // T, (top + side - 1) // T):
+                    inside = (gx >= 0) & (gy >= 0) & (gx < cols) & (gy < rows)
+                    hit[inside] |= solid[gy[inside], gx[inside]] > 0
+
+        # rects som ikke er hele tiles: sjekkes per boks (sjeldent)
+        if collision.has_extra:
+            box = pygame.Rect(0, 0, side, side)
+            for i, j in zip(*np.nonzero(~hit)):
+                box.x, box.y = int(left[i, j]), int(top[i, j])
+                if collision.collides(box):
+                    hit[i, j] = True
+        return hit
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.pos = np.zeros((capacity, 2), dtype=np.float64)
+        self.prev = np.zeros((capacity, 2), dtype=np.float64)
+        self.dir = np.zeros((capacity, 2), dtype=np.float64)
+        self.speed = np.zeros(capacity, dtype=np.float64)
+        self.damage = np.zeros(capacity, dtype=np.int32)
+
+    def _reserve(self, needed):
+        if needed <= self.capacity:
+            return
+        cap = self.capacity
+        while cap < needed:
+            cap *= 2
+        old = (self.pos, self.prev, self.dir, self.speed, self.damage)
+        n = self.count
+        self._allocate(cap)
+        for dst, src in zip((self.pos, self.prev, self.dir, self.speed, self.damage), old):
+            dst[:n] = src[:n]
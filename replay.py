@@ -0,0 +1,174 @@
+"""
+Deterministisk opptak og avspilling.
+
+Et opptak er rot-seeden til World.rng, tick-lengden og én kompakt post per
+tick (knapper som bitmaske + sikte i world-koordinater), pluss en state-hash
+hver REPLAY_CHECKPOINT_TICKS. Siden all spill-logikk går på SimClock og
+seedede random-strømmer, gir samme seed + samme input samme kjøring – og
+avspillingen kan gå headless så fort CPU-en klarer.
+
+Brukes til å gjenskape en ytelsestopp eller en feil (første avvikende
+checkpoint viser omtrent når tilstanden divergerte), og som perf-regresjon
+(ms/tick for et fast opptak).
+
+    python replay.py last_run.replay
+    python replay.py last_run.replay --no-check
+"""
+import argparse
+import hashlib
+import json
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+import constants
+from gamecontroller import InputState
+from headless import HeadlessGame
+
+MAGIC = b"RPLY1\n"
+
+_UP, _DOWN, _LEFT, _RIGHT, _FIRE = 1, 2, 4, 8, 16
+
+
+def state_hash(world, player, room_manager=None):
+    """Hash (hex) av simuleringstilstanden: klokke, spiller, fiender, powerups, kuler, partikler, dører."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(struct.pack("<d", world.clock.get_ticks()))
+    h.update(struct.pack("<4i3d", *player.rect, player.health, player.speed, player.attack_cooldown))
+    for e in world.enemies:
+        h.update(struct.pack("<2diq", e.pos.x, e.pos.y, e.health, e.handle))
+        h.update(e.state.encode())
+    for pu in world.powerups:
+        h.update(struct.pack("<4i", *pu.rect))
+    n = world.projectiles.count
+    h.update(world.projectiles.pos[:n].tobytes())
+    n = world.particles.count
+    h.update(world.particles.pos[:n].tobytes())
+    if room_manager is not None:
+        h.update(struct.pack("<i?", room_manager.rooms_loaded, bool(room_manager._doors_open)))
+    return h.hexdigest()
+
+
+class Recording:
+    """
+    Input-logg for én kjøring.
+
+    Public API:
+      - record(inp, world, player, room_manager): legg til tickens input (etter ticken);
+        lagrer state-hash på checkpoint-ticks.
+      - input_at(i) -> InputState, len(rec)
+      - save(path) / Recording.load(path)
+      - seed, tick_ms, screen_size, checkpoint_every, checkpoints {tick: hash}
+    """
+
+    def __init__(self, seed, tick_ms=None, screen_size=(1280, 720), checkpoint_every=None):
+        self.seed = seed
+        self.tick_ms = tick_ms if tick_ms is not None else constants.SIM_TICK_MS
+        self.screen_size = tuple(screen_size)
+        self.checkpoint_every = checkpoint_every or constants.REPLAY_CHECKPOINT_TICKS
+        self.checkpoints = {}
+        self._buttons = array("B")
+        self._aim = array("d")
+
+    def __len__(self):
+        return len(self._buttons)
+
+    def record(self, inp, world, player, room_manager=None):
+        bits = ((_UP if inp.up else 0) | (_DOWN if inp.down else 0) | (_LEFT if inp.left else 0)
+                | (_RIGHT if inp.right else 0) | (_FIRE if inp.fire else 0))
+        self._buttons.append(bits)
+        self._aim.extend((inp.aim[0], inp.aim[1]))
+        tick = len(self._buttons)
+        if tick % self.checkpoint_every == 0:
+            self.checkpoints[tick] = state_hash(world, player, room_manager)
+
+    def input_at(self, i):
+        bits = self._buttons[i]
+        return InputState(
+            up=bool(bits & _UP), down=bool(bits & _DOWN),
+            left=bool(bits & _LEFT), right=bool(bits & _RIGHT),
+            aim=(self._aim[2 * i], self._aim[2 * i + 1]),
+            fire=bool(bits & _FIRE),
+        )
+
+    # ---------- fil ----------
+    def save(self, path):
+        header = {
+            "seed": self.seed,
+            "tick_ms": self.tick_ms,
+            "screen_size": self.screen_size,
+            "checkpoint_every": self.checkpoint_every,
+            "ticks": len(self),
+            "checkpoints": {str(k): v for k, v in self.checkpoints.items()},
+        }
+        payload = zlib.compress(self._buttons.tobytes() + self._aim.tobytes())
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            f.write(payload)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("ikke et replay-opptak: %s" % path)
+            header = json.loads(f.readline())
+            raw = zlib.decompress(f.read())
+        rec = cls(header["seed"], header["tick_ms"], header["screen_size"], header["checkpoint_every"])
+        n = header["ticks"]
+        rec._buttons.frombytes(raw[:n])
+        rec._aim.frombytes(raw[n:])
+        rec.checkpoints = {int(k): v for k, v in header["checkpoints"].items()}
+        return rec
+
+
+def replay(rec, check=True, stop_on_mismatch=True):
+    """
+    Spill av et opptak headless så fort som mulig.
+
+    Returnerer {"ticks", "seconds", "ms_per_tick", "checked", "mismatches"}, der
+    mismatches er checkpoint-ticks med annen state-hash enn i opptaket.
+    """
+    game = HeadlessGame(screen_size=rec.screen_size, tick_ms=rec.tick_ms, seed=rec.seed)
+    checked = 0
+    mismatches = []
+    t0 = time.perf_counter()
+    for i in range(len(rec)):
+        game.step(rec.input_at(i))
+        expected = rec.checkpoints.get(i + 1) if check else None
+        if expected is not None:
+            checked += 1
+            if state_hash(game.world, game.player, game.room_manager) != expected:
+                mismatches.append(i + 1)
+                if stop_on_mismatch:
+                    break
+    seconds = time.perf_counter() - t0
+    ticks = game.ticks
+    return {
+        "ticks": ticks,
+        "seconds": round(seconds, 4),
+        "ms_per_tick": round(seconds * 1000.0 / max(1, ticks), 4),
+        "checked": checked,
+        "mismatches": mismatches,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("path", nargs="?", default=constants.REPLAY_PATH)
+    ap.add_argument("--no-check", action="store_true", help="ikke sammenlign state-hasher")
+    ap.add_argument("--all", action="store_true", help="fortsett etter første avvik")
+    args = ap.parse_args(argv)
+
+    rec = Recording.load(args.path)
+    result = replay(rec, check=not args.no_check, stop_on_mismatch=not args.all)
+    print("%d ticks  %.3f ms/tick  %d checkpoints sjekket" % (result["ticks"], result["ms_per_tick"], result["checked"]))
+    if result["mismatches"]:
+        print("AVVIK ved tick %s" % ", ".join(map(str, result["mismatches"])))
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+import random
+
+class RngStreams:
+    """
+    Uavhengige, seedede random.Random-strømmer per delsystem.
+
+    Hver strøm seedes fra (rot-seed, navn), så et delsystem som trekker flere
+    eller færre tall ikke forskyver de andre (f.eks. flere partikler endrer
+    ikke fiendenes wander-valg). Uten seed trekkes rot-seeden fra den globale
+    random-modulen, så random.seed(...) før spillet bygges fortsatt gir samme kjøring.
+
+    Public API:
+      - seed: rot-seeden (lagres i replay-opptak).
+      - stream(name): random.Random for delsystemet (samme objekt hver gang).
+      - reseed(seed=None): ny rot-seed; alle strømmer seedes på nytt på stedet,
+        så objekter som holder en strøm fortsetter å virke.
+      - getstate() / setstate(state): rot-seed + tilstanden til hver strøm (snapshot).
+    """
+
+    def __init__(self, seed=None):
+        self._streams = {}
+        self.reseed(seed)
+
+    def reseed(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(63)
+        self.seed = seed
+        for name, r in self._streams.items():
+            r.seed(self._derive(name))
+
+    def stream(self, name):
+        r = self._streams.get(name)
+        if r is None:
+            r = self._streams[name] = random.Random(self._derive(name))
+        return r
+
+    def getstate(self):
+        return self.seed, {name: r.getstate() for name, r in self._streams.items()}
+
+    def setstate(self, state):
+        seed, states = state
+        self.seed = seed
+        for name, r in self._streams.items():
+            if name not in states:
+                r.seed(self._derive(name))  # laget etter snapshotet → som ny
+        for name, st in states.items():
+            self.stream(name).setstate(st)
+
+    # ---------- helpers ----------
+    def _derive(self, name):
+        # str-seeds hashes med sha512 i random → stabilt mellom prosesser
+        return "%d:%s" % (self.seed, name)
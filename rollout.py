@@ -0,0 +1,164 @@
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from grid_obs import CHANNELS
+from vec_env import VecEnv, ACTION_DIM, PLAYER_FEATURES, ENEMY_FEATURES
+
+
+def _shm_array(shm, shape, dtype):
+    return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker(worker_id, conn, names, num_envs, envs_per_worker, obs_dim, env_kwargs, seed):
+    """Kjører i egen prosess: én VecEnv, skriver resultater rett i delt minne."""
+    shms = {key: shared_memory.SharedMemory(name=name) for key, name in names.items()}
+    try:
+        actions = _shm_array(shms["actions"], (num_envs, ACTION_DIM), np.float32)
+        obs = _shm_array(shms["obs"], (num_envs, obs_dim), np.float32)
+        rewards = _shm_array(shms["rewards"], (num_envs,), np.float32)
+        dones = _shm_array(shms["dones"], (num_envs,), np.bool_)
+
+        lo = worker_id * envs_per_worker
+        hi = lo + envs_per_worker
+        grid_out = None
+        if "grid" in shms:
+            # GridObservation.observe(out=...) skriver rett i delt minne
+            grid_out = _shm_array(shms["grid"], _grid_shape(num_envs, env_kwargs["grid_radius"]), np.float32)[lo:hi]
+        env = VecEnv(envs_per_worker, seed=seed, grid_out=grid_out, **env_kwargs)
+
+        while True:
+            cmd = conn.recv()
+            if cmd == "step":
+                o, r, d = env.step(actions[lo:hi])
+                obs[lo:hi] = o
+                rewards[lo:hi] = r
+                dones[lo:hi] = d
+            elif cmd == "reset":
+                obs[lo:hi] = env.reset()
+                rewards[lo:hi] = 0.0
+                dones[lo:hi] = False
+            elif cmd == "close":
+                break
+            conn.send(True)
+    finally:
+        # arrays må slippes før minnet kan lukkes
+        actions = obs = rewards = dones = grid_out = env = None
+        for shm in shms.values():
+            shm.close()
+        conn.close()
+
+
+def _grid_shape(num_envs, radius):
+    size = 2 * radius + 1
+    return (num_envs, len(CHANNELS), size, size)
+
+
+class RolloutRunner:
+    """
+    Mange uavhengige spill fordelt på en pool av worker-prosesser.
+
+    Hver worker eier envs_per_worker spill (en VecEnv); spill nr. i (globalt)
+    seedes med seed + i, som i én stor VecEnv. Actions, observasjoner, rewards og dones ligger i
+    delt minne; over pipen går bare korte kommandoer ("step"/"reset"), så
+    ingen spilltilstand pickles mellom prosessene.
+
+    Samme grensesnitt som VecEnv: reset() og step(actions) returnerer
+    (N, ...)-arrays som peker inn i det delte minnet (overskrives ved neste kall).
+    Med grid_radius (sendes videre til VecEnv) er self.grid en delt
+    (N, len(CHANNELS), 2r+1, 2r+1) float32-array som workerne fyller direkte.
+    Husk close() (eller bruk som context manager).
+    """
+
+    def __init__(self, num_workers=None, envs_per_worker=1, seed=0, start_method=None, **env_kwargs):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.envs_per_worker = envs_per_worker
+        self.num_envs = self.num_workers * envs_per_worker
+        k_enemies = env_kwargs.get("k_enemies", 8)
+        self.obs_dim = PLAYER_FEATURES + k_enemies * ENEMY_FEATURES
+
+        n = self.num_envs
+        layout = {
+            "actions": ((n, ACTION_DIM), np.float32),
+            "obs": ((n, self.obs_dim), np.float32),
+            "rewards": ((n,), np.float32),
+            "dones": ((n,), np.bool_),
+        }
+        if env_kwargs.get("grid_radius") is not None:
+            layout["grid"] = (_grid_shape(n, env_kwargs["grid_radius"]), np.float32)
+        self._shms = {}
+        arrays = {}
+        for key, (shape, dtype) in layout.items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._shms[key] = shm
+            arrays[key] = _shm_array(shm, shape, dtype)
+        self.actions = arrays["actions"]
+        self.obs = arrays["obs"]
+        self.rewards = arrays["rewards"]
+        self.dones = arrays["dones"]
+        self.grid = arrays.get("grid")
+
+        ctx = mp.get_context(start_method)
+        names = {key: shm.name for key, shm in self._shms.items()}
+        self._conns = []
+        self._procs = []
+        for wid in range(self.num_workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker,
+                args=(wid, child, names, n, envs_per_worker, self.obs_dim, env_kwargs,
+                      seed + wid * envs_per_worker),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def reset(self):
+        self._broadcast("reset")
+        return self.obs
+
+    def step(self, actions):
+        self.actions[:] = np.asarray(actions, dtype=np.float32).reshape(self.num_envs, ACTION_DIM)
+        self._broadcast("step")
+        return self.obs, self.rewards, self.dones
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._conns:
+            try:
+                conn.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for conn in self._conns:
+            conn.close()
+        # arrays må slippes før minnet kan lukkes
+        self.actions = self.obs = self.rewards = self.dones = self.grid = None
+        for shm in self._shms.values():
+            shm.close()
+            shm.unlink()
+
+    # ---------- helpers ----------
+    def _broadcast(self, cmd):
+        # send til alle først, så jobber workerne parallelt
+        for conn in self._conns:
+            conn.send(cmd)
+        for conn in self._conns:
+            conn.recv()
@@ -1,11 +1,8 @@
 import pygame
 import constants
 from grid_room import GridRoom
-from door import Door
 from power_up import Speed_Powerup, Attack_Powerup, Shield_Powerup
-from enemy import Enemy
-import random
-import copy
+from room_prefetch import RoomPrefetcher
 
 
 class RoomManager:
@@ -16,16 +13,22 @@ class RoomManager:
 
         self.rooms = []
         self.doors = []
+        self.rooms_loaded = 0  # teller rombytter (brukes av agent-miljøer)
+        self._doors_open = None  # nåværende dørtilstand; None = ukjent (før første lasting)
+        # Kandidat-rom forberedes litt hver tick, så rombyttet bare bytter pekere
+        self.prefetch = RoomPrefetcher()
 
         self._build_demo_grid_rooms()
         self.current_room_type = "start"
         self._load_room(self.rooms[self.current_room_type][0], entry_side="N")
 
     def update(self):
+        self.prefetch.step()
+
         cleared = (len(self.world.enemies) == 0)
-        for d in self.doors:
-            d["door"].set_open(cleared)
-        self._sync_door_blockers()
+        # Kantstyrt: dører og blockers røres bare når rommet blir ryddet/lukket
+        if cleared != self._doors_open:
+            self._set_doors_open(cleared)
 
         if cleared:
             for d in self.doors:
@@ -37,52 +40,51 @@ class RoomManager:
                     break
 
     def draw(self, screen):
+        view = self.camera.visible_rect()
         for d in self.doors:
-            d["door"].draw(screen, self.camera)
+            if view.colliderect(d["door"].rect):
+                d["door"].draw(screen, self.camera)
 
     def _go_to_next_room(self, entry_side):
+        rng = self.world.rng.stream("rooms")
         if self.current_room_type == "reward":
             candidates = self.rooms["combat"]
         else:
             candidates = (
                 self.rooms["reward"]
-                if random.random() < 0.25
+                if rng.random() < 0.25
                 else self.rooms["combat"]
             )
 
-        nxt = random.choice(candidates)
+        nxt = rng.choice(candidates)
         self._load_room(nxt, entry_side)
 
+    def _next_candidates(self):
+        """Alle rom _go_to_next_room kan velge fra nåværende rom (for prefetch)."""
+        if self.current_room_type == "reward":
+            return list(self.rooms["combat"])
+        return self.rooms["reward"] + self.rooms["combat"]
+
 
     def _load_room(self, room, entry_side):
         self.current_room_type = room
-        self.world.clear()
-        room.reset_spawns()
-
-        for gy in range(room.rows):
-            for gx in range(room.cols):
-                if room.terrain[gy][gx] == constants.TILE_WALL:
-                    self.world.add_obstacle(room.tile_rect(gx, gy))
-
-        self.doors = []
-        for gy in range(room.rows):
-            for gx in range(room.cols):
-                tag = room.spawns[gy][gx]
-                if not tag: 
-                    continue
-                x, y = gx * constants.TILE_SIZE, gy * constants.TILE_SIZE
-                if tag == 'enemy':
-                    self.world.add_enemy(x, y)
-                elif tag == 'speed_powerup':
-                    self.world.add_powerup(Speed_Powerup(x, y, 20))
-                elif tag == 'attack_powerup':
-                    self.world.add_powerup(Attack_Powerup(x, y, 20))
-                elif tag == 'shield_powerup':
-                    self.world.add_powerup(Shield_Powerup(x, y, 20))
-                elif tag == 'door':
-                    drect = pygame.Rect(x, y, constants.TILE_SIZE, constants.TILE_SIZE)
-                    self.doors.append({"door": Door(drect), "g": (gx, gy)})
-                room.spawns[gy][gx] = None  # tøm markør
+        self.rooms_loaded += 1
+
+        # Ferdig forberedt rom (kollisjon, nav, obstacles med lukkede dører, flate)
+        # byttes inn med pekere; bygges synkront bare hvis prefetch ikke rakk det
+        prep = self.prefetch.take(room)
+        self.world.load_prepared(prep)
+
+        for tag, x, y in prep.spawns:
+            if tag == 'enemy':
+                self.world.add_enemy(x, y)
+            elif tag == 'speed_powerup':
+                self.world.add_powerup(Speed_Powerup(x, y, 20))
+            elif tag == 'attack_powerup':
+                self.world.add_powerup(Attack_Powerup(x, y, 20))
+            elif tag == 'shield_powerup':
+                self.world.add_powerup(Shield_Powerup(x, y, 20))
+        self.doors = prep.doors
 
         # 4) Player spawn
         spawn_side = constants.OPPOSITE.get(entry_side) if entry_side else None
@@ -91,33 +93,34 @@ class RoomManager:
         else:
             self.player.rect.topleft = (constants.TILE_SIZE * 2, constants.TILE_SIZE * 2)
 
+        # 5) Dørene er lukket i PreparedRoom (blockers ligger allerede inne)
+        self._doors_open = False
 
-        # 5) Lukk dører i starten
-        for d in self.doors:
-            d["door"].set_open(False)
-        self._sync_door_blockers()
-        
-        self.world.current_room = room
-
-
-    def _rect_key(self, r: pygame.Rect):
-        return (r.x, r.y, r.w, r.h)
-
-    def _sync_door_blockers(self):
-        # Fjern alle dør-blockers
-        door_keys = {self._rect_key(d["door"].rect) for d in self.doors}
-        self.world.obstacles = [
-            r for r in self.world.obstacles
-            if self._rect_key(r) not in door_keys
-        ]
-        # Legg til blockers for lukka dører
-        existing = {self._rect_key(r) for r in self.world.obstacles}
+        # Begynn å forberede neste mulige rom
+        self.prefetch.want(self._next_candidates())
+
+
+    def _set_doors_open(self, open_flag):
+        """
+        Åpne/lukk alle dører og legg til/fjern blockers inkrementelt
+        (obstacles, kollisjonsindeks, render-cache, LOS, HPA*-graf, stier, flow fields).
+        Kalles bare ved endring.
+        """
         for d in self.doors:
-            if not d["door"].is_open:
-                k = self._rect_key(d["door"].rect)
-                if k not in existing:
-                    self.world.add_obstacle(d["door"].rect)
-                    existing.add(k)
+            door = d["door"]
+            door.set_open(open_flag)
+            if self.world.nav is not None:
+                self.world.nav.set_blocked(*d["g"], not open_flag)
+            if open_flag and d["blocking"]:
+                self.world.remove_obstacle(door.block_rect)
+                d["blocking"] = False
+            elif not open_flag and not d["blocking"]:
+                self.world.add_obstacle(door.block_rect)
+                d["blocking"] = True
+        self._doors_open = open_flag
+        self.world.visibility.invalidate()
+        self.world.paths.invalidate()
+        self.world.flow_fields.clear()
 
     def door_side(self, room, gx, gy):
         if gx == 0: return "W"
@@ -0,0 +1,129 @@
+import pygame
+
+import constants
+from collision_grid import CollisionGrid
+from door import Door
+from hpa import HierarchicalNav, wants_hpa
+from world import bake_static
+
+class PreparedRoom:
+    """
+    Alt et rom trenger ved lasting, ferdig bygd på forhånd (bakbufferet).
+
+    Inneholder kollisjonsindeks, HPA*-graf (store rom), obstacles (vegger + lukkede
+    dør-blockers), dør-lista, spawn-posisjoner og (med display) ferdig bakt
+    terreng-flate. World.load_prepared() bytter dette inn med pekere, så
+    rombyttet koster omtrent som en vanlig frame.
+
+    Collision, nav og doors endres mens rommet spilles (dører åpnes), så et
+    PreparedRoom brukes én gang; RoomPrefetcher lager et nytt etterpå.
+
+    Bygges stegvis med steps() (én generator-del per tick) eller helt med build().
+    HPA*-grafen deles i ett steg per klyngerad (grenser) og ett per klynge
+    (intra-stier), så et steg koster ~1-2 ms også i store rom.
+    """
+
+    def __init__(self, room):
+        self.room = room
+        self.ready = False
+        self.collision = None
+        self.nav = None
+        self.obstacles = None
+        self.doors = None           # [{"door", "g", "blocking"}, ...] – dører starter lukket
+        self.spawns = None          # [(tag, x, y), ...] i spawn_list-rekkefølge
+        self.static_surface = None
+        self.static_origin = (0, 0)
+
+    def build(self):
+        for _ in self.steps():
+            pass
+        return self
+
+    def steps(self):
+        room = self.room
+        T = constants.TILE_SIZE
+
+        # dører + spawns (billig, fra den kompilerte spawn-lista)
+        self.doors = []
+        self.spawns = []
+        for gx, gy, tag in room.spawn_list:
+            if tag == 'door':
+                door = Door(pygame.Rect(gx * T, gy * T, T, T))
+                self.doors.append({"door": door, "g": (gx, gy), "blocking": True})
+            else:
+                self.spawns.append((tag, gx * T, gy * T))
+
+        # kollisjon og obstacles med lukkede dører
+        self.collision = CollisionGrid.from_room(room)
+        self.obstacles = list(room.wall_rects)
+        for d in self.doors:
+            self.obstacles.append(d["door"].block_rect)
+            self.collision.add_rect(d["door"].block_rect)
+        yield
+
+        # HPA*-graf bare for store rom (små rom bruker flow fields); bygges
+        # klynge for klynge så ingen enkelt-tick får hele kostnaden
+        if wants_hpa(room):
+            self.nav = HierarchicalNav(room, blocked=[d["g"] for d in self.doors], build=False)
+            yield from self.nav.build_steps()
+
+        # terreng-flate bare når noe faktisk tegnes (ikke headless)
+        if pygame.display.get_surface() is not None:
+            self.static_surface, self.static_origin = bake_static(room, self.obstacles)
+        self.ready = True
+
+
+class RoomPrefetcher:
+    """
+    Forbereder kandidat-rom mens nåværende rom spilles.
+
+    Arbeidet gjøres kooperativt på hovedtråden: step() kjører én del av ett
+    PreparedRoom per kall (RoomManager kaller den én gang per tick). Da er det
+    ingen låser, pygame-flater lages på riktig tråd, og rekkefølgen er
+    deterministisk (ingen globale random-kall under forberedelsen).
+
+    Public API:
+      - want(rooms): sett hvilke rom som skal holdes klare.
+      - step(): gjør ett arbeidssteg (no-op når alt er klart).
+      - take(room): ferdig PreparedRoom (bygges synkront hvis det ikke er klart).
+      - Tellere: hits (ferdig ved bytte), misses (måtte bygges synkront).
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._wanted = []
+        self._ready = {}       # room -> PreparedRoom
+        self._job = None       # (room, PreparedRoom, generator)
+
+    def want(self, rooms):
+        self._wanted = list(rooms)
+
+    def step(self):
+        if self._job is None:
+            room = next((r for r in self._wanted if r not in self._ready), None)
+            if room is None:
+                return
+            prep = PreparedRoom(room)
+            self._job = (room, prep, prep.steps())
+
+        room, prep, steps = self._job
+        try:
+            next(steps)
+        except StopIteration:
+            self._ready[room] = prep
+            self._job = None
+
+    def take(self, room):
+        prep = self._ready.pop(room, None)
+        if prep is not None:
+            self.hits += 1
+            return prep
+        self.misses += 1
+        if self._job is not None and self._job[0] is room:
+            prep = self._job[1]
+            for _ in self._job[2]:
+                pass
+            self._job = None
+            return prep
+        return PreparedRoom(room).build()
@@ -0,0 +1,28 @@
+import pygame
+
+class WallClock:
+    """Sanntid fra pygame (standard når spillet kjøres med vindu)."""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+    def advance(self, dt_ms):
+        pass  # veggklokka går av seg selv
+
+
+class SimClock:
+    """
+    Simuleringsklokke i ms som bare går når noen kaller advance(dt_ms).
+
+    Brukes headless: World.update flytter klokka med gitt dt, så simuleringen
+    kan kjøres mye raskere (eller saktere) enn sanntid.
+    """
+
+    def __init__(self, start_ms=0):
+        self.now_ms = start_ms
+
+    def get_ticks(self):
+        return int(self.now_ms)
+
+    def advance(self, dt_ms):
+        self.now_ms += dt_ms
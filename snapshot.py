@@ -0,0 +1,328 @@
+"""
+Billige snapshots av hele spilltilstanden (for søkebaserte agenter: MCTS, rollouts).
+
+capture(game) pakker alt som endrer seg mens spillet går inn i én flat
+bytes-buffer: klokke, spiller, fiender, EntityStore-håndtak, kuler, partikler,
+random-strømmer, dørtilstand og tellere. restore(game, snap) skriver det
+tilbake på stedet – eksisterende Enemy-objekter og NumPy-arrays gjenbrukes,
+ingenting deepcopy-es.
+
+Det som ikke endres deles i stedet for å kopieres (Snapshot.shared):
+GridRoom-terrenget, rommets kollisjonsindeks, HPA*-graf, obstacles og dør-lista
+(disse endres bare når dørene åpnes/lukkes, og det gjenskapes fra dørflagget),
+powerup-objektene (endres aldri etter spawn) og PathCache-stiene (tuples).
+Derfor kan restore også gå tilbake til et rom spilleren har forlatt.
+
+game er alt med .world, .player, .room_manager og .camera (HeadlessGame).
+Klokka må være en SimClock for at tiden skal tilbakestilles.
+
+    snap = game.snapshot()
+    for _ in range(rollouts):
+        game.restore(snap)
+        ...  # spill videre
+"""
+import math
+import struct
+from array import array
+
+import numpy as np
+import pygame
+from pygame.math import Vector2
+
+import constants
+from enemy import Enemy
+
+ENEMY_STATES = ("idle", "chase", "search", "attack", "hurt", "dead", "walk")
+_STATE_ID = {name: i for i, name in enumerate(ENEMY_STATES)}
+
+_NONE = -0x80000000  # "None" i heltallsfelt
+_NO_XY = (_NONE, _NONE)
+_NAN = float("nan")
+_DOORS = {False: 0, True: 1, None: 2}
+
+# klokke, kamera, AI-tick/snitt, spiller, rom, PathCache, antall (fiender, powerups,
+# kuler, partikler, slot-tabeller, strømmer), HeadlessGame-tellere
+_HEAD = struct.Struct(
+    "<d2dqd"         # clock_ms, camera.offset, ai.tick, ai._think_ms
+    "4i3i?q?3q"      # player: rect, speed, health, dps, alive, attack_cooldown, playerAttack, buffs
+    "iBq?"           # rooms_loaded, doors_open, paths.version, paths på rommet
+    "9i"             # n_enemies, n_powerups, n_proj, n_particles, e_gen, e_free, p_gen, p_free, n_streams
+    "qii"            # ticks, kills, rooms_cleared
+)
+_ENEMY = struct.Struct(
+    "<2d2ii??B"      # pos, rect.topleft, health, alive, hit, state
+    "q2iqqq4i"       # hit_timer, last_seen_pos, search_started, attack_cooldown_until, debug_attack_until/rect
+    "2iqq2i"         # wander_goal_g, next_wander_at, ai_next_tick, _steer_target
+    "ii2iqi"         # sti: ref, indeks, key (mål, versjon, max_len)
+)
+_MT = struct.Struct("<B625Id")   # random.Random: versjon, intern tilstand, gauss_next
+_PCG = struct.Struct("<16s16siI")  # numpy PCG64: state, inc, has_uint32, uinteger
+
+_BUFFS = tuple(constants.BUFF_DURATIONS)
+
+
+class Snapshot:
+    """
+    Én lagret tilstand.
+
+    Public API:
+      - data: flat bytes med all tilstand som endres.
+      - shared: tuple med delte (uforanderlige) objekter som data refererer til.
+      - nbytes: len(data).
+    """
+
+    __slots__ = ("data", "shared")
+
+    def __init__(self, data, shared):
+        self.data = data
+        self.shared = shared
+
+    @property
+    def nbytes(self):
+        return len(self.data)
+
+
+def capture(game):
+    """Ta et snapshot av game (mellom ticks)."""
+    world, player, rm = game.world, game.player, game.room_manager
+    enemies = list(world.enemies)
+    powerups = tuple(world.powerups)
+    e_slots, e_gen, e_free = world.enemies.layout()
+    p_slots, p_gen, p_free = world.powerups.layout()
+    proj, parts = world.projectiles, world.particles
+    n_proj, n_parts = proj.count, parts.count
+    seed, streams = world.rng.getstate()
+    names = tuple(streams)
+
+    buffs = player.buff_timers
+    think_ms = world.ai._think_ms
+    head = _HEAD.pack(
+        getattr(world.clock, "now_ms", _NAN), game.camera.offset.x, game.camera.offset.y,
+        world.ai.tick, _NAN if think_ms is None else think_ms,
+        *player.rect, player.speed, player.health, player.dps, player.alive,
+        player.attack_cooldown, player.playerAttack, *[buffs.get(b, _NONE) for b in _BUFFS],
+        rm.rooms_loaded, _DOORS[rm._doors_open], world.paths.version,
+        world.paths._room is world.current_room,
+        len(enemies), len(powerups), n_proj, n_parts, len(e_gen), len(e_free), len(p_gen), len(p_free), len(names),
+        getattr(game, "ticks", 0), getattr(game, "kills", 0), getattr(game, "rooms_cleared", 0),
+    )
+
+    path_ids = {}
+    paths = []
+    records = []
+    for e in enemies:
+        path = e._path
+        if path is None:
+            pid = -1
+        else:
+            pid = path_ids.get(id(path))
+            if pid is None:
+                pid = path_ids[id(path)] = len(paths)
+                paths.append(path)
+        key = e._path_key
+        if key is None:
+            pgoal, pver, pmax = _NO_XY, 0, _NONE
+        else:
+            pgoal, pver, pmax = key[0], key[1], _NONE if key[2] is None else key[2]
+        atk = e.debug_attack_rect
+        records.append(_ENEMY.pack(
+            e.pos.x, e.pos.y, e.rect.x, e.rect.y, e.health, e.alive, e.hit, _STATE_ID[e.state],
+            _NONE if e.hit_timer is None else e.hit_timer,
+            *(e.last_seen_pos or _NO_XY),
+            _NONE if e.search_started is None else e.search_started,
+            e.attack_cooldown_until, e.debug_attack_until,
+            *(atk if atk is not None else (_NONE, 0, 0, 0)),
+            *(e.wander_goal_g or _NO_XY), e.next_wander_at, e.ai_next_tick,
+            *(e._steer_target or _NO_XY),
+            pid, e._path_i, *pgoal, pver, pmax,
+        ))
+
+    pcg = parts.rng.bit_generator.state
+    parts_out = [
+        head,
+        b"".join(records),
+        array("i", e_slots).tobytes(), array("i", e_gen).tobytes(), array("i", e_free).tobytes(),
+        array("i", p_slots).tobytes(), array("i", p_gen).tobytes(), array("i", p_free).tobytes(),
+        proj.pos[:n_proj].tobytes(), proj.dir[:n_proj].tobytes(),
+        proj.speed[:n_proj].tobytes(), proj.damage[:n_proj].tobytes(),
+        parts.pos[:n_parts].tobytes(), parts.vel[:n_parts].tobytes(), parts.timer[:n_parts].tobytes(),
+        parts.color[:n_parts].tobytes(), parts.size[:n_parts].tobytes(),
+        _PCG.pack(pcg["state"]["state"].to_bytes(16, "little"), pcg["state"]["inc"].to_bytes(16, "little"),
+                  pcg["has_uint32"], pcg["uinteger"]),
+    ]
+    for name in names:
+        version, internal, gauss = streams[name]
+        parts_out.append(_MT.pack(version, *internal, _NAN if gauss is None else gauss))
+
+    shared = (
+        world.current_room, rm.current_room_type, rm.doors, world.collision, world.nav, world.obstacles,
+        powerups, tuple(paths), names, seed, pcg["bit_generator"],
+    )
+    return Snapshot(b"".join(parts_out), shared)
+
+
+def restore(game, snap):
+    """Sett game tilbake til snap på stedet."""
+    world, player, rm = game.world, game.player, game.room_manager
+    (room, room_type, doors, collision, nav, obstacles,
+     powerups, paths, names, seed, bit_gen_name) = snap.shared
+    data = snap.data
+    head = _HEAD.unpack_from(data, 0)
+    off = _HEAD.size
+    (clock_ms, cam_x, cam_y, ai_tick, think_ms,
+     prx, pry, prw, prh, p_speed, p_health, p_dps, p_alive, p_cooldown, p_attack, *buff_starts) = head[:18]
+    (rooms_loaded, doors_open, paths_version, paths_on_room,
+     n_enemies, n_powerups, n_proj, n_parts, e_gen, e_free, p_gen, p_free, n_streams,
+     ticks, kills, rooms_cleared) = head[18:]
+
+    # ---------- klokke, kamera, spiller ----------
+    if not math.isnan(clock_ms):
+        world.clock.now_ms = clock_ms
+    game.camera.offset.update(cam_x, cam_y)
+    world.ai.tick = ai_tick
+    world.ai._think_ms = None if math.isnan(think_ms) else think_ms
+    player.rect.update(prx, pry, prw, prh)
+    player.speed, player.health, player.dps, player.alive = p_speed, p_health, p_dps, p_alive
+    player.attack_cooldown, player.playerAttack = p_cooldown, p_attack
+    player.buff_timers.clear()
+    for name, start in zip(_BUFFS, buff_starts):
+        if start != _NONE:
+            player.buff_timers[name] = start
+    for attr, value in (("ticks", ticks), ("kills", kills), ("rooms_cleared", rooms_cleared)):
+        if hasattr(game, attr):
+            setattr(game, attr, value)
+
+    # ---------- rom (delt terreng) + dører ----------
+    # Sammenlign objektene fra hver lasting, ikke rommet: samme GridRoom kan
+    # lastes på nytt med ny kollisjon/dør-liste (lukkede dører).
+    swapped = world.collision is not collision or rm.doors is not doors
+    if swapped:
+        world.current_room = room
+        world._use_terrain(collision, nav)
+        world.obstacles = obstacles
+        world.invalidate_static()
+        rm.doors = doors
+    if rm.current_room_type is not room_type:
+        rm.current_room_type = room_type
+        rm.prefetch.want(rm._next_candidates())
+    rm.rooms_loaded = rooms_loaded
+    doors_open = (False, True, None)[doors_open]
+    live = rm.doors[0]["door"].is_open if rm.doors else doors_open
+    if doors_open is not None and live != doors_open:
+        rm._set_doors_open(doors_open)
+    rm._doors_open = doors_open
+
+    # PathCache: innholdet er en ren memo for (rom, dørtilstand) – beholdes når versjonen er lik
+    pc = world.paths
+    if swapped or pc.version != paths_version or pc._room is not room:
+        pc._paths.clear()
+    pc.version = paths_version
+    pc._room = room if paths_on_room else None
+
+    # ---------- fiender ----------
+    store = world.enemies
+    objs = list(store)
+    while len(objs) < n_enemies:
+        objs.append(_blank_enemy(world))
+    del objs[n_enemies:]
+    end = off + n_enemies * _ENEMY.size
+    for e, rec in zip(objs, _ENEMY.iter_unpack(data[off:end])):
+        (px, py, rx, ry, health, alive, hit, state, hit_timer, lsx, lsy, search_started,
+         atk_until, dbg_until, ax, ay, aw, ah, wgx, wgy, next_wander, ai_next, stx, sty,
+         pid, path_i, pgx, pgy, pver, pmax) = rec
+        e.pos.update(px, py)
+        e.prev_pos.update(px, py)
+        e.rect.x, e.rect.y = rx, ry
+        e.health, e.alive, e.hit, e.state = health, alive, hit, ENEMY_STATES[state]
+        e.hit_timer = None if hit_timer == _NONE else hit_timer
+        e.last_seen_pos = None if lsx == _NONE else (lsx, lsy)
+        e.search_started = None if search_started == _NONE else search_started
+        e.attack_cooldown_until, e.debug_attack_until = atk_until, dbg_until
+        e.debug_attack_rect = None if ax == _NONE else pygame.Rect(ax, ay, aw, ah)
+        e.wander_goal_g = None if wgx == _NONE else (wgx, wgy)
+        e.next_wander_at, e.ai_next_tick = next_wander, ai_next
+        e._steer_target = None if stx == _NONE else (stx, sty)
+        e._path = None if pid < 0 else paths[pid]
+        e._path_i = path_i
+        e._path_key = None if pgx == _NONE else ((pgx, pgy), pver, None if pmax == _NONE else pmax)
+    off = end
+    e_slots, off = _ints(data, off, n_enemies)
+    e_gens, off = _ints(data, off, e_gen)
+    e_frees, off = _ints(data, off, e_free)
+    store.restore_layout(objs, e_slots, e_gens, e_frees)
+    world.enemy_hash.clear()  # bygges uansett på nytt først i World.update
+
+    # ---------- powerups (delte objekter) ----------
+    p_slots, off = _ints(data, off, n_powerups)
+    p_gens, off = _ints(data, off, p_gen)
+    p_frees, off = _ints(data, off, p_free)
+    world.powerups.restore_layout(list(powerups), p_slots, p_gens, p_frees)
+    world.powerup_hash.rebuild(powerups)
+
+    # ---------- kuler og partikler ----------
+    proj = world.projectiles
+    proj._reserve(n_proj)
+    off = _array_into(proj.pos, data, off, n_proj)
+    off = _array_into(proj.dir, data, off, n_proj)
+    off = _array_into(proj.speed, data, off, n_proj)
+    off = _array_into(proj.damage, data, off, n_proj)
+    proj.count = n_proj
+    proj.prev[:n_proj] = proj.pos[:n_proj]
+
+    parts = world.particles
+    parts._reserve(n_parts)
+    for arr in (parts.pos, parts.vel, parts.timer, parts.color, parts.size):
+        off = _array_into(arr, data, off, n_parts)
+    parts.count = n_parts
+    parts.prev[:n_parts] = parts.pos[:n_parts]
+    state, inc, has_uint32, uinteger = _PCG.unpack_from(data, off)
+    off += _PCG.size
+    parts.rng.bit_generator.state = {
+        "bit_generator": bit_gen_name,
+        "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+        "has_uint32": has_uint32,
+        "uinteger": uinteger,
+    }
+
+    # ---------- random-strømmer ----------
+    states = {}
+    for name in names:
+        version, *internal, gauss = _MT.unpack_from(data, off)
+        off += _MT.size
+        states[name] = (version, tuple(internal), None if math.isnan(gauss) else gauss)
+    world.rng.setstate((seed, states))
+
+    if world.occupancy is not None:
+        world.occupancy.resync(world)
+
+
+# ---------- helpers ----------
+def _ints(data, off, n):
+    end = off + 4 * n
+    out = array("i")
+    out.frombytes(data[off:end])
+    return out.tolist(), end
+
+
+def _array_into(arr, data, off, n):
+    """Kopier n rader fra data (fra off) inn i arr[:n]; returnerer ny offset."""
+    row = arr.strides[0]
+    if n:
+        arr[:n] = np.frombuffer(data, dtype=arr.dtype, count=n * row // arr.itemsize, offset=off).reshape((n,) + arr.shape[1:])
+    return off + n * row
+
+
+def _blank_enemy(world):
+    """Enemy uten __init__ (den trekker fra rng-strømmen); restore() fyller inn resten."""
+    e = Enemy.__new__(Enemy)
+    e.clock = world.clock
+    e.rng = world.rng.stream("enemy")
+    e.rect = pygame.Rect(0, 0, *constants.ENEMY_SIZE)
+    e.pos = Vector2()
+    e.prev_pos = Vector2()
+    e.speed = constants.ENEMY_SPEED
+    e.dps = constants.ENEMY_DPS
+    e.WANDER_INTERVAL_MS = constants.ENEMY_WANDER_INTERVAL_MS
+    e.WANDER_RADIUS_TILES = constants.ENEMY_WANDER_RADIUS_TILES
+    e._defer_motion = False
+    return e
@@ -0,0 +1,127 @@
+import constants
+
+class SpatialHash:
+    """
+    Uniform grid-hash (broadphase) for objekter med .rect.
+
+    Hvert objekt ligger i alle cellene rect-en dekker. Oppslag ser bare på
+    cellene rundt spørringen i stedet for alle objekter.
+
+    Public API:
+      - rebuild(objs): tøm og sett inn alle objekter på nytt.
+      - insert(obj) / remove(obj): legg til/fjern ett objekt.
+      - update(obj): flytt objektet til nye celler hvis rect har endret seg.
+      - query_rect(rect): objekter hvis rect overlapper rect.
+      - query_radius(x, y, radius): kandidater innenfor kvadratet rundt (x, y);
+        kalleren gjør eksakt avstandstest.
+
+    Rekkefølgen på resultatene er deterministisk (innsettingsrekkefølge per celle).
+    """
+
+    def __init__(self, cell_size=constants.TILE_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}    # (cx, cy) -> {obj: None} (dict som ordnet mengde)
+        self._ranges = {}   # obj -> (cx0, cy0, cx1, cy1)
+
+    def __len__(self):
+        return len(self._ranges)
+
+    def __contains__(self, obj):
+        return obj in self._ranges
+
+    # ---------- oppdatering ----------
+    def clear(self):
+        self._cells.clear()
+        self._ranges.clear()
+
+    def rebuild(self, objs):
+        self.clear()
+        for obj in objs:
+            self.insert(obj)
+
+    def insert(self, obj):
+        cr = self._cell_range(obj.rect)
+        self._ranges[obj] = cr
+        self._add_to_cells(obj, cr)
+
+    def remove(self, obj):
+        cr = self._ranges.pop(obj, None)
+        if cr is not None:
+            self._remove_from_cells(obj, cr)
+
+    def update(self, obj):
+        old = self._ranges.get(obj)
+        if old is None:
+            self.insert(obj)
+            return
+        cr = self._cell_range(obj.rect)
+        if cr == old:
+            return
+        self._remove_from_cells(obj, old)
+        self._ranges[obj] = cr
+        self._add_to_cells(obj, cr)
+
+    # ---------- spørring ----------
+    def query_rect(self, rect):
+        """Objekter hvis rect overlapper rect."""
+        return [obj for obj in self._candidates(self._cell_range(rect)) if obj.rect.colliderect(rect)]
+
+    def query_radius(self, x, y, radius):
+        """Kandidater hvis rect overlapper kvadratet (x ± radius, y ± radius)."""
+        cs = self.cell_size
+        cr = (
+            int((x - radius) // cs), int((y - radius) // cs),
+            int((x + radius) // cs), int((y + radius) // cs)
+        )
+        return self._candidates(cr)
+
+    # ---------- helpers ----------
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (
+            rect.left // cs, rect.top // cs,
+            (rect.right - 1) // cs, (rect.bottom - 1) // cs
+        )
+
+    def _add_to_cells(self, obj, cr):
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = cr
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = {obj: None}
+                else:
+                    bucket[obj] = None
+
+    def _remove_from_cells(self, obj, cr):
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = cr
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.pop(obj, None)
+                    if not bucket:
+                        del cells[(cx, cy)]
+
+    def _candidates(self, cr):
+        cells = self._cells
+        cx0, cy0, cx1, cy1 = cr
+        # vanlig tilfelle: én celle → ingen duplikater mulig
+        if cx0 == cx1 and cy0 == cy1:
+            bucket = cells.get((cx0, cy0))
+            return list(bucket) if bucket else []
+
+        out = []
+        seen = set()
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    if obj not in seen:
+                        seen.add(obj)
+                        out.append(obj)
+        return out
@@ -0,0 +1,51 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from flow_field import UNREACHABLE
+from headless import HeadlessGame
+
+
+def _combat_room(seed=5):
+    game = HeadlessGame(seed=seed)
+    rm = game.room_manager
+    rm._load_room(rm.rooms["combat"][0], entry_side="N")
+    return game
+
+
+def _inside(room, g):
+    """Første gulv-nabo til en dør-tile (inne i rommet)."""
+    gx, gy = g
+    for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        nx, ny = gx + dx, gy + dy
+        if 0 < nx < room.cols - 1 and 0 < ny < room.rows - 1 and not room.is_blocked(nx, ny):
+            return (nx, ny)
+
+
+def test_closed_doors_block_flow_fields():
+    game = _combat_room()
+    rm, world = game.room_manager, game.world
+    room = world.current_room
+    assert not rm._doors_open and rm.doors
+    door_g = rm.doors[0]["g"]
+    start = _inside(room, door_g)
+
+    ff = world.flow_fields
+    assert ff.next_step(room, start, door_g) is None
+    assert ff.field(room, start).distance(*door_g) == UNREACHABLE
+
+
+def test_opening_doors_invalidates_flow_fields():
+    game = _combat_room()
+    rm, world = game.room_manager, game.world
+    room = world.current_room
+    door_g = rm.doors[0]["g"]
+    start = _inside(room, door_g)
+
+    ff = world.flow_fields
+    assert ff.field(room, start).distance(*door_g) == UNREACHABLE
+    rm._set_doors_open(True)
+    assert ff.field(room, start).distance(*door_g) == 1
+    assert ff.next_step(room, start, door_g) == door_g
+    rm._set_doors_open(False)
+    assert ff.field(room, start).distance(*door_g) == UNREACHABLE
@@ -0,0 +1,90 @@
+import random
+
+from grid_room import GridRoom
+from hpa import HierarchicalNav, wants_hpa
+from path_cache import PathCache
+
+
+def _random_room(cols, rows, seed, density=0.28):
+    rng = random.Random(seed)
+    lines = []
+    for y in range(rows):
+        lines.append("".join(
+            "#" if x in (0, cols - 1) or y in (0, rows - 1) or rng.random() < density else "."
+            for x in range(cols)
+        ))
+    return GridRoom(lines)
+
+
+def _wall_room(cols, rows, wall_x, gaps):
+    """Åpent rom delt av en loddrett vegg i wall_x med åpninger i radene gaps."""
+    lines = []
+    for y in range(rows):
+        row = []
+        for x in range(cols):
+            border = x in (0, cols - 1) or y in (0, rows - 1)
+            row.append("#" if border or (x == wall_x and y not in gaps) else ".")
+        lines.append("".join(row))
+    return GridRoom(lines)
+
+
+def _assert_valid(nav, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (x0, y0), (x1, y1) in zip(path, path[1:]):
+        assert abs(x1 - x0) + abs(y1 - y0) == 1
+    assert not any(nav.is_blocked(*t) for t in path)
+
+
+def test_find_path_matches_flat_astar():
+    ratios = []
+    for seed in range(2):
+        room = _random_room(80, 64, seed)
+        assert wants_hpa(room)
+        nav = HierarchicalNav(room)
+        flat = PathCache(max_expansions=10 ** 7)   # uten nav: vanlig A* over hele rommet
+        rng = random.Random(100 + seed)
+        free = [(x, y) for y in range(room.rows) for x in range(room.cols) if not room.is_blocked(x, y)]
+        for _ in range(100):
+            start, goal = rng.choice(free), rng.choice(free)
+            hpa_path = nav.find_path(start, goal)
+            best = flat.path(room, start, goal)
+            assert (hpa_path is None) == (best is None), (start, goal)
+            if best is None:
+                continue
+            _assert_valid(nav, hpa_path, start, goal)
+            cost, optimal = len(hpa_path) - 1, len(best) - 1
+            assert cost <= 1.5 * optimal
+            if optimal:
+                ratios.append(cost / optimal)
+    assert sum(ratios) / len(ratios) < 1.1
+
+
+def test_set_blocked_closes_and_reopens_corridor():
+    room = _wall_room(64, 40, 32, gaps=(20,))
+    nav = HierarchicalNav(room)
+    start, goal = (5, 20), (60, 20)
+    before = nav.find_path(start, goal)
+    assert before is not None and (32, 20) in before
+
+    nav.set_blocked(32, 20, True)
+    assert nav.find_path(start, goal) is None
+
+    nav.set_blocked(32, 20, False)
+    after = nav.find_path(start, goal)
+    assert after is not None and len(after) == len(before)
+
+
+def test_set_blocked_reroutes_through_other_entrance():
+    room = _wall_room(64, 40, 32, gaps=(5, 30))
+    nav = HierarchicalNav(room)
+    start, goal = (20, 30), (44, 30)
+    short = nav.find_path(start, goal)
+    assert (32, 30) in short
+
+    nav.set_blocked(32, 30, True)
+    detour = nav.find_path(start, goal)
+    _assert_valid(nav, detour, start, goal)
+    assert (32, 5) in detour and len(detour) > len(short)
+
+    nav.set_blocked(32, 30, False)
+    assert nav.find_path(start, goal) == short
@@ -0,0 +1,18 @@
+import profiler
+from profiler import FrameProfiler
+
+
+def test_nested_scopes_of_same_phase_count_once(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(profiler, "perf_counter", lambda: now[0])
+    prof = FrameProfiler(capacity=4)
+    prof.enabled = True
+    with prof.scope("a"):
+        with prof.scope("a"):
+            now[0] += 0.010
+        with prof.scope("b"):
+            now[0] += 0.010
+    prof.end_frame()
+    s = prof.summary()
+    assert s["a"]["mean"] == 20.0
+    assert s["b"]["mean"] == 10.0
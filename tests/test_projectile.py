@@ -0,0 +1,74 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import constants
+from collision_grid import CollisionGrid
+from grid_room import GridRoom
+from projectile import ProjectileSystem
+from spatial_hash import SpatialHash
+
+T = constants.TILE_SIZE
+TICK_MS = 16
+FAST = 5 * T * 1000 / TICK_MS   # fem tiles per tick – mye bredere enn både vegg og kule
+
+
+class _Target:
+    def __init__(self, x, y, size=8):
+        self.rect = pygame.Rect(x, y, size, size)
+
+
+def _corridor(wall_x=None):
+    row = "".join("#" if x == wall_x else "." for x in range(20))
+    return GridRoom(["." * 20, row, "." * 20])
+
+
+def _fire(system, x=3.5 * T, speed=FAST):
+    system.spawn((x, 1.5 * T), (1, 0), speed=speed)
+
+
+def test_fast_projectile_stops_at_one_tile_wall():
+    hash_ = SpatialHash()
+
+    open_shots = ProjectileSystem()
+    _fire(open_shots)
+    assert open_shots.update(TICK_MS, CollisionGrid.from_room(_corridor()), hash_) == []
+    assert len(open_shots) == 1 and open_shots.pos[0, 0] > 8 * T   # ett steg hopper forbi tile 5
+
+    walled = ProjectileSystem()
+    _fire(walled)
+    assert walled.update(TICK_MS, CollisionGrid.from_room(_corridor(wall_x=5)), hash_) == []
+    assert len(walled) == 0
+
+
+def test_fast_projectile_hits_small_enemy():
+    collision = CollisionGrid.from_room(_corridor())
+    target = _Target(6 * T, int(1.5 * T) - 4)
+    hash_ = SpatialHash()
+    hash_.insert(target)
+
+    system = ProjectileSystem()
+    _fire(system)
+    hits = system.update(TICK_MS, collision, hash_)
+    assert hits == [(target, constants.PROJECTILE_DAMAGE)]
+    assert len(system) == 0
+
+
+def test_pool_slots_are_reused_after_kill():
+    collision = CollisionGrid.from_room(_corridor(wall_x=5))
+    hash_ = SpatialHash()
+    system = ProjectileSystem(capacity=8)
+    arrays = (system.pos, system.dir, system.speed, system.damage)
+
+    for _ in range(3):
+        for _ in range(8):
+            _fire(system)
+        assert system.capacity == 8 and len(system) == 8
+        system.update(TICK_MS, collision, hash_)
+        assert len(system) == 0
+
+    assert all(a is b for a, b in zip((system.pos, system.dir, system.speed, system.damage), arrays))
+    system.spawn((2.5 * T, 1.5 * T), (0, 1))
+    assert len(system) == 1 and tuple(system.pos[0]) == (2.5 * T, 1.5 * T)
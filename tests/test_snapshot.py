@@ -0,0 +1,62 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from gamecontroller import InputState
+from headless import HeadlessGame
+from replay import state_hash
+
+
+def _cleared_combat_room(seed=3):
+    """Spill i et kamprom til alle fiender er døde og dørene har åpnet seg."""
+    game = HeadlessGame(seed=seed)
+    game.player.health = 10 ** 6
+    rm = game.room_manager
+    rm._load_room(rm.rooms["combat"][0], entry_side="N")
+    for e in game.world.enemies:
+        e.health = 0
+    for _ in range(5):
+        game.step(InputState())
+    assert rm._doors_open
+    return game
+
+
+def _run(game, ticks):
+    hashes = []
+    for t in range(ticks):
+        cx, cy = game.player.rect.center
+        game.step(InputState(right=t % 3 == 0, down=t % 5 == 0, fire=t % 2 == 0, aim=(cx + 100, cy)))
+        hashes.append(state_hash(game.world, game.player, game.room_manager))
+    return hashes
+
+
+def test_restore_reproduces_future():
+    game = HeadlessGame(seed=7)
+    game.player.health = 10 ** 6
+    game.room_manager._load_room(game.room_manager.rooms["combat"][1], entry_side="N")
+    _run(game, 30)
+    snap = game.snapshot()
+    expected = _run(game, 120)
+    game.restore(snap)
+    assert _run(game, 120) == expected
+
+
+def test_restore_after_reentering_same_room():
+    game = _cleared_combat_room()
+    rm, world = game.room_manager, game.world
+    room = world.current_room
+    snap = game.snapshot()
+    expected = _run(game, 60)
+
+    # samme rom lastes på nytt: ny PreparedRoom med lukkede dører og fiender
+    rm._load_room(room, entry_side="E")
+    assert world.current_room is room and not rm._doors_open
+
+    game.restore(snap)
+    assert rm._doors_open
+    for d in rm.doors:
+        assert d["door"].is_open and not d["blocking"]
+        assert not world.collides(d["door"].block_rect)
+        assert not world.collision.is_blocked(*d["g"])
+    assert len(world.enemies) == 0
+    assert _run(game, 60) == expected
@@ -0,0 +1,69 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import constants
+from collision_grid import CollisionGrid
+from grid_room import GridRoom
+from visibility import PlayerVisibility, has_los
+
+
+def _open_room(cols=25, rows=25):
+    lines = ["#" * cols]
+    lines += ["#" + "." * (cols - 2) + "#" for _ in range(rows - 2)]
+    lines += ["#" * cols]
+    return GridRoom(lines)
+
+
+def _visibility(room, player_g, collision=None):
+    vis = PlayerVisibility(radius=8)
+    vis.collision = collision
+    vis.update(room, player_g)
+    return vis
+
+
+def test_open_room_matches_bresenham():
+    room = _open_room()
+    vis = _visibility(room, (12, 12))
+    for gy in range(room.rows):
+        for gx in range(room.cols):
+            if (gx - 12) ** 2 + (gy - 12) ** 2 <= 8 * 8 and not room.is_blocked(gx, gy):
+                assert vis.can_see((gx, gy)) == has_los(room, gx, gy, 12, 12)
+                assert vis.can_see((gx, gy))
+    assert not vis.can_see((12, 12 + 9))   # utenfor radius
+    assert not vis.can_see((-1, 12))       # utenfor rommet
+
+
+def test_walls_cast_shadows():
+    lines = [list(row) for row in (
+        "#########",
+        "#.......#",
+        "#.......#",
+        "#...#...#",
+        "#.......#",
+        "#########",
+    )]
+    room = GridRoom(["".join(r) for r in lines])
+    vis = _visibility(room, (1, 3))
+    assert vis.can_see((3, 3))
+    assert not vis.can_see((5, 3))
+    assert not vis.can_see((7, 3))
+    assert vis.can_see((7, 1))
+
+
+def test_door_blockers_stop_sight_until_removed():
+    room = _open_room()
+    collision = CollisionGrid.from_room(room)
+    T = constants.TILE_SIZE
+    blocker = pygame.Rect(14 * T, 12 * T, T, T)
+    collision.add_rect(blocker)
+
+    vis = _visibility(room, (12, 12), collision)
+    assert vis.can_see((13, 12))
+    assert not vis.can_see((16, 12))
+
+    collision.remove_rect(blocker)
+    vis.invalidate()
+    assert vis.can_see((16, 12))
@@ -0,0 +1,35 @@
+class FixedTimestep:
+    """
+    Akkumulator for fast simuleringssteg uavhengig av render-FPS.
+
+    Hver render-frame legges frame-tiden til, og advance() sier hvor mange
+    faste ticks som skal simuleres. Maks max_ticks ticks per frame: henger vi
+    etter mer enn det, kastes resten (vi dropper render-frames i stedet for å
+    ta igjen med stadig lengre dt → "spiral of death").
+
+    alpha (0..1) er hvor langt vi er mellom forrige og neste tick, til
+    interpolering når vi tegner.
+    """
+
+    def __init__(self, tick_ms, max_ticks):
+        self.tick_ms = tick_ms
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+        self.dropped_ms = 0.0   # total simuleringstid som er kastet pga. catch-up-grensa
+
+    def advance(self, frame_ms):
+        """Legg til frame-tid og returner antall ticks som skal kjøres nå."""
+        self.accumulator += frame_ms
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_ticks:
+            # kjør max_ticks nå, resten av etterslepet kastes
+            keep = self.max_ticks * self.tick_ms
+            self.dropped_ms += self.accumulator - keep
+            self.accumulator = keep
+            ticks = self.max_ticks
+        self.accumulator -= ticks * self.tick_ms
+        return ticks
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.tick_ms
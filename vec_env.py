@@ -0,0 +1,144 @@
+import heapq
+
+import numpy as np
+
+import constants
+from gamecontroller import InputState
+from grid_obs import CHANNELS, GridObservation
+from headless import HeadlessGame
+
+# Rekkefølge = tallet som havner i observasjonen
+ENEMY_STATES = ("idle", "chase", "search", "attack", "hurt", "dead")
+STATE_IDS = {name: i for i, name in enumerate(ENEMY_STATES)}
+
+# action[i] = [move_x, move_y, fire, aim_dx, aim_dy]
+#   move_x/move_y: fortegn gir retning (-1, 0, 1)
+#   fire: > 0.5 betyr skyt
+#   aim_dx/aim_dy: sikte relativt til spillerens senter (px)
+ACTION_DIM = 5
+
+PLAYER_FEATURES = 7   # x, y (tiles), health, speed, dps, dører åpne, antall fiender
+ENEMY_FEATURES = 5    # finnes, dx, dy (tiles), health, state
+
+
+class VecEnv:
+    """
+    N uavhengige spill (World + RoomManager + Player) i én prosess, steppet i takt.
+
+    step(actions) tar en (N, ACTION_DIM)-array og returnerer stablede
+    NumPy-arrays (obs, rewards, dones). Et spill som er ferdig (spilleren død
+    eller max_steps nådd) resettes automatisk via RoomManager._load_room, og
+    obs for det miljøet er da første observasjon i ny episode.
+
+    Obs-radene er spillerdata + de k_enemies nærmeste fiendene (relativ pos).
+    Med grid_radius fylles i tillegg self.grid (N, len(CHANNELS), 2r+1, 2r+1)
+    med grid_obs.GridObservation sentrert på spilleren. grid_out er en valgfri
+    ferdig array med den formen (f.eks. delt minne i RolloutRunner) som
+    GridObservation skriver rett inn i.
+    NB: returnerte arrays gjenbrukes og overskrives ved neste step/reset.
+
+    Med seed får spill i seed + i; reset(seed) seeder alle strømmene på nytt
+    på samme måte. Den globale random-modulen røres ikke.
+
+    Reward per step: kills * reward_kill + nye rom * reward_room
+                     + endring i helse * reward_health (negativ ved skade).
+    """
+
+    def __init__(self, num_envs, k_enemies=8, max_steps=None, tick_ms=None, seed=None,
+                 reward_kill=1.0, reward_room=5.0, reward_health=1.0, grid_radius=None, grid_out=None):
+        self.num_envs = num_envs
+        self.k_enemies = k_enemies
+        self.max_steps = max_steps
+        self.reward_kill = reward_kill
+        self.reward_room = reward_room
+        self.reward_health = reward_health
+
+        self.games = [HeadlessGame(tick_ms=tick_ms, seed=None if seed is None else seed + i)
+                      for i in range(num_envs)]
+
+        self.obs_dim = PLAYER_FEATURES + k_enemies * ENEMY_FEATURES
+        self.obs = np.zeros((num_envs, self.obs_dim), dtype=np.float32)
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+
+        self.grid = None
+        self._grid_obs = None
+        if grid_radius is not None:
+            size = 2 * grid_radius + 1
+            shape = (num_envs, len(CHANNELS), size, size)
+            if grid_out is None:
+                grid_out = np.zeros(shape, dtype=np.float32)
+            elif grid_out.shape != shape or grid_out.dtype != np.float32:
+                raise ValueError("grid_out må være float32 med form %s" % (shape,))
+            self.grid = grid_out
+            self._grid_obs = [GridObservation(game, grid_radius) for game in self.games]
+
+    def reset(self, seed=None):
+        for i, game in enumerate(self.games):
+            game.reset(None if seed is None else seed + i)
+            self._observe(i, game)
+        return self.obs
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.float32).reshape(self.num_envs, ACTION_DIM)
+        move = np.sign(actions[:, :2]).astype(np.int8)
+        fire = actions[:, 2] > 0.5
+        aim = actions[:, 3:5]
+
+        for i, game in enumerate(self.games):
+            px, py = game.player.rect.center
+            mx, my = move[i]
+            inp = InputState(
+                up=my < 0, down=my > 0, left=mx < 0, right=mx > 0,
+                aim=(px + float(aim[i, 0]), py + float(aim[i, 1])),
+                fire=bool(fire[i]),
+            )
+
+            health_before = game.player.health
+            alive = game.step(inp)
+
+            self.rewards[i] = (
+                game.kills * self.reward_kill
+                + game.rooms_cleared * self.reward_room
+                + (game.player.health - health_before) * self.reward_health
+            )
+            done = not alive or (self.max_steps is not None and game.ticks >= self.max_steps)
+            self.dones[i] = done
+            if done:
+                game.reset()
+            self._observe(i, game)
+
+        return self.obs, self.rewards, self.dones
+
+    # ---------- helpers ----------
+    def _observe(self, i, game):
+        T = constants.TILE_SIZE
+        row = self.obs[i]
+        row.fill(0.0)
+
+        player = game.player
+        px, py = player.rect.center
+        doors = game.room_manager.doors
+        row[0] = px / T
+        row[1] = py / T
+        row[2] = player.health
+        row[3] = player.speed
+        row[4] = player.dps
+        row[5] = 1.0 if doors and doors[0]["door"].is_open else 0.0
+        row[6] = len(game.world.enemies)
+        if self._grid_obs is not None:
+            self._grid_obs[i].observe(out=self.grid[i])
+
+        def dist2(e):
+            dx, dy = e.pos.x - px, e.pos.y - py
+            return dx * dx + dy * dy
+
+        nearest = heapq.nsmallest(self.k_enemies, game.world.enemies, key=dist2)
+        base = PLAYER_FEATURES
+        for e in nearest:
+            row[base] = 1.0
+            row[base + 1] = (e.pos.x - px) / T
+            row[base + 2] = (e.pos.y - py) / T
+            row[base + 3] = e.health
+            row[base + 4] = STATE_IDS.get(e.state, 0)
+            base += ENEMY_FEATURES
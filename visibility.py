@@ -0,0 +1,142 @@
+from array import array
+
+import constants
+
+
+def has_los(room, from_x, from_y, to_x, to_y):
+    """
+    Line-of-sight på GRID (Bresenham).
+    Alle koordinater er grid (tiles), ikke piksler.
+    Returnerer True hvis linjen fra (from_x, from_y) til (to_x, to_y)
+    ikke passerer noen blokkerte tiles (start-tilen sjekkes ikke).
+    """
+    dx = abs(to_x - from_x)
+    dy = -abs(to_y - from_y)
+    x_steps = 1 if from_x < to_x else -1
+    y_steps = 1 if from_y < to_y else -1
+    err = dx + dy
+
+    x, y = from_x, from_y
+    while True:
+        if (x, y) != (from_x, from_y) and room.is_blocked(x, y):
+            return False
+        if x == to_x and y == to_y:
+            return True
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x += x_steps
+        if e2 <= dx:
+            err += dx
+            y += y_steps
+
+
+# Oktant-transformasjoner (xx, xy, yx, yy) for shadowcasting rundt spilleren
+_OCTANTS = (
+    (1, 0, 0, 1), (0, 1, 1, 0), (0, -1, 1, 0), (-1, 0, 0, 1),
+    (-1, 0, 0, -1), (0, -1, -1, 0), (0, 1, -1, 0), (1, 0, 0, -1),
+)
+
+
+class PlayerVisibility:
+    """
+    Hvilke tiles ser spilleren? Felles for alle fiender i rommet.
+
+    Synsfeltet regnes ut én gang per spiller-tile (rekursiv shadowcasting i
+    8 oktanter ut til radius tiles) og lagres som et flatt stempel-array, så
+    can_see er ett oppslag uansett hvor mange fiender som spør. Blokkerte tiles
+    hentes fra collision (CollisionGrid, satt av World), så lukkede dører
+    stopper sikten; uten collision brukes room.is_blocked (bare terreng).
+    Utregningen skjer først når noen spør, så en spiller uten fiender i nærheten
+    koster ingenting.
+
+    Public API:
+      - update(room, player_g): kall én gang per frame før fiendene oppdateres.
+      - invalidate(): tving ny beregning (f.eks. når en dør åpnes/lukkes).
+      - can_see(from_g): True hvis tile from_g er i spillerens synsfelt.
+      - radius: rekkevidde i tiles (dekker DETECTION_RADIUS).
+      - collision: CollisionGrid med dører, eller None.
+    """
+
+    def __init__(self, radius=None):
+        if radius is None:
+            radius = -(-constants.DETECTION_RADIUS // constants.TILE_SIZE) + 1
+        self.radius = radius
+        self.collision = None
+        self._room = None
+        self._player_g = None
+        self._dirty = True
+        self._stamp = 0
+        self._seen = array("I")   # tile -> stempel; synlig hvis lik _stamp
+
+    def update(self, room, player_g):
+        if room is not self._room or player_g != self._player_g:
+            self._room = room
+            self._player_g = player_g
+            self._dirty = True
+
+    def invalidate(self):
+        self._dirty = True
+
+    def can_see(self, from_g):
+        if self._dirty:
+            self._compute()
+        gx, gy = from_g
+        room = self._room
+        if gx < 0 or gy < 0 or gx >= room.cols or gy >= room.rows:
+            return False
+        return self._seen[gy * room.cols + gx] == self._stamp
+
+    # ---------- helpers ----------
+    def _compute(self):
+        self._dirty = False
+        room = self._room
+        n = room.cols * room.rows
+        if len(self._seen) != n:
+            self._seen = array("I", bytes(4 * n))
+            self._stamp = 0
+        self._stamp += 1
+        px, py = self._player_g
+        if 0 <= px < room.cols and 0 <= py < room.rows:
+            self._seen[py * room.cols + px] = self._stamp
+        is_blocked = self.collision.is_blocked if self.collision is not None else room.is_blocked
+        for octant in _OCTANTS:
+            self._cast(px, py, 1, 1.0, 0.0, octant, is_blocked)
+
+    def _cast(self, cx, cy, row, start, end, octant, is_blocked):
+        """Marker synlige tiles i én oktant mellom skråningene start og end (fra rad row)."""
+        if start < end:
+            return
+        xx, xy, yx, yy = octant
+        radius = self.radius
+        r2 = radius * radius
+        cols, rows = self._room.cols, self._room.rows
+        seen, stamp = self._seen, self._stamp
+        new_start = start
+        for j in range(row, radius + 1):
+            blocked = False
+            dy = -j
+            for dx in range(-j, 1):
+                l_slope = (dx - 0.5) / (dy + 0.5)
+                r_slope = (dx + 0.5) / (dy - 0.5)
+                if start < r_slope:
+                    continue
+                if end > l_slope:
+                    break
+                x = cx + dx * xx + dy * xy
+                y = cy + dx * yx + dy * yy
+                if dx * dx + dy * dy <= r2 and 0 <= x < cols and 0 <= y < rows:
+                    seen[y * cols + x] = stamp
+                wall = is_blocked(x, y)
+                if blocked:
+                    if wall:
+                        new_start = r_slope
+                    else:
+                        blocked = False
+                        start = new_start
+                elif wall and j < radius:
+                    blocked = True
+                    self._cast(cx, cy, j + 1, start, l_slope, octant, is_blocked)
+                    new_start = r_slope
+            if blocked:
+                return
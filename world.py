@@ -1,16 +1,59 @@
 import pygame
 import constants
 from enemy import Enemy
-from particle import Particle
-import random
+from particle import ParticleSystem
+from projectile import ProjectileSystem
+from collision_grid import CollisionGrid
+from spatial_hash import SpatialHash
+from flow_field import FlowFieldCache
+from path_cache import PathCache
+from hpa import HierarchicalNav, wants_hpa
+from visibility import PlayerVisibility
+from ai_scheduler import AIScheduler
+from enemy_motion import move_enemies
+from sim_clock import WallClock
+from entity_store import EntityStore
+from profiler import PROFILER
+from rng import RngStreams
+from time import perf_counter
 
 class World:
-    def __init__(self):
+    def __init__(self, clock=None, seed=None):
+        # Klokke for all spill-logikk (WallClock i spillet, SimClock headless)
+        self.clock = clock if clock is not None else WallClock()
+        # Seedede random-strømmer per delsystem (enemy, spawn, rooms, particles)
+        self.rng = RngStreams(seed)
+
         self.obstacles = []
-        self.enemies = []
-        self.powerups = []
-        self.particles = []
-        self.projectiles = []
+        # Tette lagre med stabile håndtak; fjerning skjer samlet på slutten av ticken
+        self.enemies = EntityStore()
+        self.powerups = EntityStore()
+        self.particles = ParticleSystem(rng=self.rng.stream("particles"))
+        self.projectiles = ProjectileSystem()
+        self.collision = CollisionGrid(0, 0)
+
+        # Broadphase: fiender bygges på nytt hver frame, powerups holdes ved like ved add/fjern
+        self.enemy_hash = SpatialHash()
+        self.powerup_hash = SpatialHash()
+
+        # Delte avstandskart mot spillerens sist sette tile (search-pathfinding)
+        self.flow_fields = FlowFieldCache()
+        # Hele stier (wander) delt mellom fiender, ugyldiggjort ved rom-/dørendring
+        self.paths = PathCache()
+        # HPA*-graf for store rom (None i små rom; dører oppdaterer den)
+        self.nav = None
+        # Spillerens synsfelt (shadowcasting), regnet én gang per spiller-tile
+        self.visibility = PlayerVisibility()
+        # Hvilke fiender som tenker denne ticken (LOD + budsjett); resten beholder
+        # styremålet og flyttes samlet av move_enemies
+        self.ai = AIScheduler()
+        # Valgfri grid_obs.TileOccupancy (agent-observasjoner); holdes ved like når satt
+        self.occupancy = None
+
+        # Ferdigtegnet terreng + vegger (bakes når rommet/obstacles endres)
+        self._static_surface = None
+        self._static_origin = (0, 0)
+        self._static_room = None
 
     # ---------- world content mgmt ----------
     def clear(self):
@@ -19,6 +62,15 @@ class World:
         self.powerups.clear()
         self.particles.clear()
         self.projectiles.clear()
+        self.enemy_hash.clear()
+        self.powerup_hash.clear()
+        self.flow_fields.clear()
+        self.paths.clear()
+        self._use_terrain(CollisionGrid(0, 0), None)
+        self.visibility.invalidate()
+        self.invalidate_static()
+        if self.occupancy is not None:
+            self.occupancy.reset(None)
 
     def load_blueprint(self, bp: dict):
         """
@@ -30,103 +82,185 @@ class World:
         """
         self.clear()
         for r in bp.get("obstacles", []):
-            self.obstacles.append(r)
+            self.add_obstacle(r)
         for e in bp.get("enemies", []):
             x, y, w, h = e
-            self.enemies.append(Enemy(x, y, w, h))
+            self.add_enemy(x, y)
         for p in bp.get("powerups", []):
-            self.powerups.append(p)
+            self.add_powerup(p)
+
+    def load_prepared(self, prep):
+        """
+        Bytt inn et ferdig forberedt rom (room_prefetch.PreparedRoom).
+
+        Kollisjon, HPA*-graf, obstacles og bakt flate tas over som de er (bare
+        pekere byttes); fiender/powerups spawnes av kalleren.
+        """
+        self.clear()
+        self.current_room = prep.room
+        self._use_terrain(prep.collision, prep.nav)
+        self.obstacles = prep.obstacles
+        if prep.static_surface is not None:
+            self._static_surface = prep.static_surface
+            self._static_origin = prep.static_origin
+            self._static_room = prep.room
+        if self.occupancy is not None:
+            self.occupancy.reset(prep.room)
+
+    def load_terrain(self, room):
+        """Bygg vegg-obstacles, kollisjonsindeks og (store rom) HPA*-graf fra GridRoom-terrenget."""
+        self._use_terrain(CollisionGrid.from_room(room), HierarchicalNav(room) if wants_hpa(room) else None)
+        self.obstacles.extend(room.wall_rects)  # delte, ferdigbygde rects
+        self.invalidate_static()
+        if self.occupancy is not None:
+            self.occupancy.reset(room)
 
     # ---------- public api ----------
     def add_obstacle(self, rect: pygame.Rect):
         self.obstacles.append(rect)
+        self.collision.add_rect(rect)
+        self.invalidate_static()
+
+    def remove_obstacle(self, rect: pygame.Rect):
+        self.obstacles.remove(rect)
+        self.collision.remove_rect(rect)
+        self.invalidate_static()
+
+    def reseed(self, seed=None):
+        """Ny rot-seed for alle random-strømmer (f.eks. ny episode / replay)."""
+        self.rng.reseed(seed)
+        self.particles.reseed(self.rng.stream("particles"))
+
+    def invalidate_static(self):
+        """Marker at terreng/vegger må bakes på nytt ved neste draw (rombytte, dør åpnet/lukket)."""
+        self._static_surface = None
+
+    def collides(self, rect: pygame.Rect) -> bool:
+        """True hvis rect overlapper vegg, lukket dør eller annen obstacle."""
+        return self.collision.collides(rect)
 
     def add_enemy(self, x, y):
-        self.enemies.append(Enemy(x, y))
+        enemy = Enemy(x, y, self.clock, self.rng.stream("enemy"))
+        self.enemies.add(enemy)
+        if self.occupancy is not None:
+            self.occupancy.enemy_moved(enemy)
 
     def add_powerup(self, powerup):
-        self.powerups.append(powerup)
+        self.powerups.add(powerup)
+        self.powerup_hash.insert(powerup)
+        if self.occupancy is not None:
+            self.occupancy.powerup_added(powerup)
 
     def spawn_hit_particles(self, x, y, n=5, color=constants.YELLOW):
-        for _ in range(n):
-            self.particles.append(Particle(x, y, color))
+        self.particles.spawn(x, y, n, color)
 
     def update(self, dt_ms: int, player, camera):
-        # Enemies
-        for enemy in self.enemies[:]:
-            enemy.move(player, self.obstacles, self.current_room, dt_ms)
-            enemy._apply_separation(self.enemies)
-            if enemy.hit:
-                self.spawn_hit_particles(enemy.rect.centerx, enemy.rect.centery, n=5)
-                enemy.hit = False
-            if not enemy.alive:
-                self.spawn_hit_particles(enemy.rect.centerx, enemy.rect.centery, n=10)
-                self.enemies.remove(enemy)
-
-        for projectile in self.projectiles[:]:
-            projectile.update(dt_ms, self.obstacles)
-
-            # treff fiender
+        self.clock.advance(dt_ms)
+
+        # Enemies (hashen bygges én gang og oppdateres etter hver flytt)
+        enemy_hash = self.enemy_hash
+        with PROFILER.scope("world.broadphase"):
+            enemy_hash.rebuild(self.enemies)
+            self.visibility.update(self.current_room, player._grid_pos())
+            think = self.ai.schedule(self.enemies, player)
+        sep_radius = constants.ENEMY_SEPARATION_RADIUS
+        occupancy = self.occupancy
+        # store rom (med HPA*-graf): bare delte søkemål får flow field, resten går via PathCache/HPA*
+        self.flow_fields.shared = None if self.nav is None else self._shared_search_goals()
+        # tenk-tiden måles bare med tidsbudsjett, og da samlet for hele løkka
+        timed = self.ai.time_budget_ms is not None
+        with PROFILER.scope("world.enemies"):
+            # 1) tenk (sansing/state/plan) → styremål; de andre beholder forrige mål
+            t0 = perf_counter() if timed else 0.0
             for enemy in self.enemies:
-                if projectile.rect.colliderect(enemy.rect):
-                    enemy.health -= projectile.damage
-                    enemy.hit = True
-                    projectile.alive = False
-                    break
-            
-            if not projectile.alive:
-                self.projectiles.remove(projectile)
+                enemy.prev_pos.update(enemy.pos)
+                if enemy in think:
+                    enemy.move(player, self.collision, self.current_room, dt_ms,
+                               self.flow_fields, self.visibility, defer_motion=True, paths=self.paths)
+            if timed:
+                self.ai.record(len(think), perf_counter() - t0)
+            # 2) alle flyttes samlet mot målet sitt (vektorisert sliding mot tile-gridet)
+            with PROFILER.scope("enemy.movement"):
+                move_enemies(self.enemies, self.collision, dt_ms)
+            # 3) separasjon, treff og død
+            for enemy in self.enemies:
+                enemy_hash.update(enemy)
+                enemy._apply_separation(enemy_hash.query_radius(enemy.pos.x, enemy.pos.y, sep_radius + 1))
+                enemy_hash.update(enemy)
+                if occupancy is not None:
+                    occupancy.enemy_moved(enemy)
+                if enemy.hit:
+                    self.spawn_hit_particles(enemy.rect.centerx, enemy.rect.centery, n=5)
+                    enemy.hit = False
+                if not enemy.alive:
+                    self.spawn_hit_particles(enemy.rect.centerx, enemy.rect.centery, n=10)
+                    self.enemies.discard(enemy)
+                    enemy_hash.remove(enemy)
+                    if occupancy is not None:
+                        occupancy.enemy_removed(enemy)
+
+        # Projectiles: sveipes mot tile-gridet og fiende-broadphase
+        with PROFILER.scope("world.projectiles"):
+            for enemy, damage in self.projectiles.update(dt_ms, self.collision, enemy_hash):
+                enemy.health -= damage
+                enemy.hit = True
+            if occupancy is not None:
+                occupancy.projectiles_moved(self.projectiles)
 
         # Powerups
-        for pu in self.powerups[:]:
-            if player.rect.colliderect(pu.rect):
-                pu.apply(player)
-                self.powerups.remove(pu)
-
-        # Particles
-        for p in self.particles[:]:
-            p.update(dt_ms)
-            if p.timer <= 0:
-                self.particles.remove(p)
-
-    def draw(self, screen, camera):
+        for pu in self.powerup_hash.query_rect(player.rect):
+            pu.apply(player)
+            self.powerups.discard(pu)
+            self.powerup_hash.remove(pu)
+            if occupancy is not None:
+                occupancy.powerup_removed(pu)
+
+        # Particles (alle på én gang, utløpte kompakteres bort)
+        with PROFILER.scope("world.particles"):
+            self.particles.update(dt_ms)
+
+        # Samlet fjerning (swap-remove) av alt som døde/ble plukket denne ticken
+        self.enemies.flush()
+        self.powerups.flush()
+
+    def draw(self, screen, camera, alpha=1.0):
+        """Tegn rommet; fiender, kuler og partikler interpoleres med alpha (FixedTimestep.alpha)."""
         if not hasattr(self, "current_room") or self.current_room is None:
             return  # ingenting å tegne
 
-        room = self.current_room
-        for gy in range(room.rows):
-            for gx in range(room.cols):
-                rect = pygame.Rect(
-                    gx * constants.TILE_SIZE,
-                    gy * constants.TILE_SIZE,
-                    constants.TILE_SIZE,
-                    constants.TILE_SIZE
+        # Terreng + obstacles: én blit av ferdigbakt flate
+        view = camera.visible_rect()
+        with PROFILER.scope("draw.terrain"):
+            if self._static_surface is None or self._static_room is not self.current_room:
+                self._bake_static()
+            # (kun den synlige delen av flaten kopieres)
+            ox, oy = self._static_origin
+            area = view.move(-ox, -oy).clip(self._static_surface.get_rect())
+            if area.width and area.height:
+                screen.blit(
+                    self._static_surface,
+                    (ox + area.x - camera.offset.x, oy + area.y - camera.offset.y),
+                    area
                 )
-                dr = camera.apply(rect)
-                if room.terrain[gy][gx] == constants.TILE_WALL:
-                    pygame.draw.rect(screen, (80, 80, 80), dr)  # vegg
-                else:
-                    pygame.draw.rect(screen, (25, 25, 25), dr)  # gulv
-        # Obstacles
-        for obstacle in self.obstacles:
-            sr = camera.apply(obstacle)
-            pygame.draw.rect(screen, (128, 128, 128), sr)
 
-        # Powerups
-        for pu in self.powerups:
-            pu.draw(screen, camera)
+        # Entiteter: tegn bare det som overlapper skjermen
+        with PROFILER.scope("draw.entities"):
+            # Powerups
+            for pu in self.powerups:
+                if view.colliderect(pu.rect):
+                    pu.draw(screen, camera)
 
-        # Enemies
-        for e in self.enemies:
-            e.draw(screen, camera)
-        
-        # Projectiles
-        for projectile in self.projectiles:
-            projectile.draw(screen, camera)
+            # Enemies (angreps-hitboxen kan stikke utenfor selve rect-en)
+            for e in self.enemies:
+                if view.colliderect(e.rect) or (e.debug_attack_rect and view.colliderect(e.debug_attack_rect)):
+                    e.draw(screen, camera, alpha)
 
-        # Particles
-        for p in self.particles:
-            p.draw(screen, camera)
+            # Projectiles
+            self.projectiles.draw(screen, camera, alpha)
+
+        # Particles (culles og tegnes samlet)
+        with PROFILER.scope("draw.particles"):
+            self.particles.draw(screen, camera, alpha)
 
 
         # (Valgfritt) debug: tegn obstacle outlines
@@ -135,6 +269,32 @@ class World:
         #     pygame.draw.rect(screen, (200, 200, 200), sr, 1)
 
     # ---------- helpers ----------
+    def _use_terrain(self, collision, nav):
+        """Sett kollisjonsindeks og HPA*-graf; delte stisøk og flow fields bruker de samme blockers."""
+        self.collision = collision
+        self.nav = self.paths.nav = nav
+        self.paths.collision = collision
+        self.flow_fields.clear()
+        self.flow_fields.collision = collision
+        self.visibility.collision = collision
+        self.visibility.invalidate()
+
+    def _shared_search_goals(self):
+        """Mål-tiles som minst NAV_FLOW_MIN_SEARCHERS fiender i 'search' jakter nå."""
+        T = constants.TILE_SIZE
+        counts = {}
+        for e in self.enemies:
+            if e.state == "search" and e.last_seen_pos:
+                g = (e.last_seen_pos[0] // T, e.last_seen_pos[1] // T)
+                counts[g] = counts.get(g, 0) + 1
+        n = constants.NAV_FLOW_MIN_SEARCHERS
+        return {g for g, c in counts.items() if c >= n}
+
+    def _bake_static(self):
+        """Tegn terreng og alle obstacles én gang til en egen flate."""
+        self._static_surface, self._static_origin = bake_static(self.current_room, self.obstacles)
+        self._static_room = self.current_room
+
     def _build_room(self):
         """Eksempel på å fylle inn rommet med noen rektangler."""
         # Yttervegger / søyler osv.
@@ -144,8 +304,29 @@ class World:
         # self.add_enemy(600, 400)
         
     def spawn_wave(self, n, area_rect: pygame.Rect):
+        rng = self.rng.stream("spawn")
         for _ in range(n):
-            x = random.randint(area_rect.left, area_rect.right - 50)
-            y = random.randint(area_rect.top, area_rect.bottom - 50)
+            x = rng.randint(area_rect.left, area_rect.right - 50)
+            y = rng.randint(area_rect.top, area_rect.bottom - 50)
             self.add_enemy(x, y)
 
+
+def bake_static(room, obstacles):
+    """Tegn gulv, vegger og obstacles til én flate. Returnerer (flate, origin i verden)."""
+    T = constants.TILE_SIZE
+    bounds = pygame.Rect(0, 0, room.cols * T, room.rows * T)
+    if obstacles:
+        bounds.union_ip(bounds.unionall(obstacles))
+
+    surf = pygame.Surface((max(1, bounds.width), max(1, bounds.height)))
+    surf.fill(constants.BLACK)
+    pygame.draw.rect(surf, (25, 25, 25), pygame.Rect(-bounds.x, -bounds.y, room.cols * T, room.rows * T))  # gulv
+    for wall in room.wall_rects:
+        pygame.draw.rect(surf, (80, 80, 80), wall.move(-bounds.x, -bounds.y))  # vegg
+    # Obstacles
+    for obstacle in obstacles:
+        pygame.draw.rect(surf, (128, 128, 128), obstacle.move(-bounds.x, -bounds.y))
+
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert()  # samme pikselformat som skjermen → rask blit
+    return surf, bounds.topleft